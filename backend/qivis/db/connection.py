@@ -12,16 +12,34 @@ class Database:
         self._conn = connection
 
     @classmethod
-    async def connect(cls, path: str = "qivis.db") -> Database:
-        """Create a connection with WAL mode, foreign keys, and schema init."""
-        conn = await aiosqlite.connect(path)
+    async def connect(cls, path: str = "qivis.db", *, uri: bool = False) -> Database:
+        """Create a connection with WAL mode, foreign keys, and schema init.
+
+        Pass uri=True to interpret path as a SQLite URI filename
+        (e.g. a named shared-cache in-memory database).
+        """
+        db = await cls._open(path, uri=uri)
+        await db._ensure_schema()
+        return db
+
+    async def copy_to(self, path: str, *, uri: bool = False) -> Database:
+        """Open a new database at path holding a copy of this one's schema and rows.
+
+        Uses SQLite's online backup API, so no schema init or migrations run.
+        """
+        db = await self._open(path, uri=uri)
+        await self._conn.backup(db._conn)
+        return db
+
+    @classmethod
+    async def _open(cls, path: str, *, uri: bool) -> Database:
+        """Open a connection with WAL mode, foreign keys and a busy timeout."""
+        conn = await aiosqlite.connect(path, uri=uri)
         conn.row_factory = aiosqlite.Row
         await conn.execute("PRAGMA journal_mode=WAL")
         await conn.execute("PRAGMA foreign_keys=ON")
         await conn.execute("PRAGMA busy_timeout=5000")
-        db = cls(conn)
-        await db._ensure_schema()
-        return db
+        return cls(conn)
 
     async def _ensure_schema(self) -> None:
         """Create tables if they don't exist. Idempotent.
@@ -59,6 +77,23 @@ class Database:
         await self._conn.commit()
         return cursor
 
+    async def executemany(self, sql: str, params_seq: list[tuple]) -> None:
+        """Execute a statement once per parameter tuple in a single transaction.
+
+        Either every row is written or, on error, none are.
+        """
+        try:
+            await self._conn.executemany(sql, params_seq)
+        except Exception:
+            await self._conn.rollback()
+            raise
+        await self._conn.commit()
+
+    async def executescript(self, script: str) -> None:
+        """Execute a multi-statement SQL script (no parameters) and commit."""
+        await self._conn.executescript(script)
+        await self._conn.commit()
+
     async def fetchone(self, sql: str, params: tuple | None = None) -> aiosqlite.Row | None:
         """Execute and return a single row."""
         cursor = await self._conn.execute(sql, params or ())
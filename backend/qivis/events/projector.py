@@ -4,9 +4,11 @@ The read side of the CQRS pattern. Currently handles RhizomeCreated and
 NodeCreated events. New handlers are added as their subphases arrive.
 """
 
+import itertools
 import json
 import logging
 from collections.abc import Awaitable, Callable
+from operator import attrgetter
 
 from qivis.db.connection import Database
 from qivis.models import (
@@ -38,6 +40,17 @@ from qivis.models import (
 
 logger = logging.getLogger(__name__)
 
+# Compact encoder for the node-ID lists stored on summaries and bookmarks:
+# built once, and no separator padding in every stored row.
+_encode_id_list = json.JSONEncoder(separators=(",", ":")).encode
+
+_INSERT_SUMMARY_SQL = """
+    INSERT OR REPLACE INTO summaries
+        (summary_id, rhizome_id, anchor_node_id, scope, summary_type,
+         summary, model, node_ids, prompt_used, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class StateProjector:
     """Projects events into materialized SQL tables (rhizomes, nodes)."""
@@ -72,7 +85,6 @@ class StateProjector:
             "NodeUnanchored": self._handle_node_unanchored,
             "NoteAdded": self._handle_note_added,
             "NoteRemoved": self._handle_note_removed,
-            "SummaryGenerated": self._handle_summary_generated,
             "SummaryRemoved": self._handle_summary_removed,
             "PerturbationReportGenerated": self._handle_perturbation_report_generated,
             "PerturbationReportRemoved": self._handle_perturbation_report_removed,
@@ -80,10 +92,19 @@ class StateProjector:
 
     async def project(self, events: list[EventEnvelope]) -> None:
         """Project a batch of events into materialized tables."""
-        for event in events:
-            handler = self._handlers.get(event.event_type)
+        for event_type, run in itertools.groupby(events, key=attrgetter("event_type")):
+            if event_type == "SummaryGenerated":
+                # Each summary is a single INSERT, so a consecutive run of
+                # them is written with one executemany.
+                await self._db.executemany(
+                    _INSERT_SUMMARY_SQL,
+                    [self._summary_generated_params(event) for event in run],
+                )
+                continue
+            handler = self._handlers.get(event_type)
             if handler:
-                await handler(event)
+                for event in run:
+                    await handler(event)
 
     async def get_rhizome(self, rhizome_id: str) -> dict | None:
         """Read projected rhizome state. Returns None if not found."""
@@ -102,6 +123,16 @@ class StateProjector:
         )
         return [dict(row) for row in rows]
 
+    async def get_node(self, rhizome_id: str, node_id: str) -> dict | None:
+        """Read a single projected node. Returns None if not found."""
+        row = await self._db.fetchone(
+            "SELECT * FROM nodes WHERE rhizome_id = ? AND node_id = ?",
+            (rhizome_id, node_id),
+        )
+        if row is None:
+            return None
+        return dict(row)
+
     async def _handle_rhizome_created(self, event: EventEnvelope) -> None:
         """Project a RhizomeCreated event into the rhizomes table."""
         payload = RhizomeCreatedPayload.model_validate(event.payload)
@@ -257,7 +288,7 @@ class StateProjector:
             (
                 payload.summary,
                 payload.model,
-                json.dumps(payload.summarized_node_ids),
+                _encode_id_list(payload.summarized_node_ids),
                 payload.bookmark_id,
             ),
         )
@@ -410,33 +441,26 @@ class StateProjector:
             (payload.note_id,),
         )
 
-    async def _handle_summary_generated(self, event: EventEnvelope) -> None:
-        """Project a SummaryGenerated event into the summaries table."""
+    @staticmethod
+    def _summary_generated_params(event: EventEnvelope) -> tuple:
+        """Column values for inserting a SummaryGenerated event into summaries."""
         payload = SummaryGeneratedPayload.model_validate(event.payload)
         timestamp = (
             event.timestamp.isoformat()
             if hasattr(event.timestamp, "isoformat")
             else str(event.timestamp)
         )
-        await self._db.execute(
-            """
-            INSERT OR REPLACE INTO summaries
-                (summary_id, rhizome_id, anchor_node_id, scope, summary_type,
-                 summary, model, node_ids, prompt_used, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                payload.summary_id,
-                event.rhizome_id,
-                payload.anchor_node_id,
-                payload.scope,
-                payload.summary_type,
-                payload.summary,
-                payload.model,
-                json.dumps(payload.node_ids),
-                payload.prompt_used,
-                timestamp,
-            ),
+        return (
+            payload.summary_id,
+            event.rhizome_id,
+            payload.anchor_node_id,
+            payload.scope,
+            payload.summary_type,
+            payload.summary,
+            payload.model,
+            _encode_id_list(payload.node_ids),
+            payload.prompt_used,
+            timestamp,
         )
 
     async def _handle_summary_removed(self, event: EventEnvelope) -> None:
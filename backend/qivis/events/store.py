@@ -12,30 +12,32 @@ class EventStore:
     def __init__(self, db: Database) -> None:
         self._db = db
 
+    _INSERT_SQL = """
+        INSERT INTO events
+            (event_id, rhizome_id, timestamp, device_id, user_id, event_type, payload)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    """
+
     async def append(self, envelope: EventEnvelope) -> int:
         """Append an event and return the assigned sequence_num.
 
         Raises IntegrityError if event_id is not unique.
         """
-        cursor = await self._db.execute(
-            """
-            INSERT INTO events
-                (event_id, rhizome_id, timestamp, device_id, user_id, event_type, payload)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                envelope.event_id,
-                envelope.rhizome_id,
-                envelope.timestamp.isoformat(),
-                envelope.device_id,
-                envelope.user_id,
-                envelope.event_type,
-                json.dumps(envelope.payload),
-            ),
-        )
+        cursor = await self._db.execute(self._INSERT_SQL, self._envelope_params(envelope))
         assert cursor.lastrowid is not None
         return cursor.lastrowid
 
+    async def append_many(self, envelopes: list[EventEnvelope]) -> None:
+        """Append several events in a single transaction, preserving order.
+
+        Raises IntegrityError (and appends nothing) if any event_id is not unique.
+        """
+        if not envelopes:
+            return
+        await self._db.executemany(
+            self._INSERT_SQL, [self._envelope_params(e) for e in envelopes],
+        )
+
     async def get_events(self, rhizome_id: str) -> list[EventEnvelope]:
         """Get all events for a rhizome, ordered by sequence_num."""
         rows = await self._db.fetchall(
@@ -63,6 +65,19 @@ class EventStore:
         )
         return [self._row_to_envelope(row) for row in rows]
 
+    @staticmethod
+    def _envelope_params(envelope: EventEnvelope) -> tuple:
+        """Column values for inserting an envelope into the events table."""
+        return (
+            envelope.event_id,
+            envelope.rhizome_id,
+            envelope.timestamp.isoformat(),
+            envelope.device_id,
+            envelope.user_id,
+            envelope.event_type,
+            json.dumps(envelope.payload),
+        )
+
     @staticmethod
     def _row_to_envelope(row) -> EventEnvelope:
         """Convert a database row to an EventEnvelope."""
@@ -226,34 +226,36 @@ class ExportService:
             "sampling_params", "usage", "logprobs", "context_usage",
         ]
 
+        # Rows are written as tuples in fieldnames order; DictWriter would build
+        # and then unpack a dict for every node.
         output = io.StringIO()
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
+        writer = csv.writer(output)
+        writer.writerow(fieldnames)
 
         for n in nodes:
             nid = n["node_id"]
-            writer.writerow({
-                "node_id": nid,
-                "parent_id": n.get("parent_id") or "",
-                "role": n["role"],
-                "content": n["content"],
-                "edited_content": n.get("edited_content") or "",
-                "model": n.get("model") or "",
-                "provider": n.get("provider") or "",
-                "latency_ms": n.get("latency_ms") or "",
-                "finish_reason": n.get("finish_reason") or "",
-                "thinking_content": n.get("thinking_content") or "",
-                "created_at": n.get("created_at") or "",
-                "annotation_tags": ",".join(tags_by_node.get(nid, [])),
-                "is_bookmarked": str(nid in bookmarked_ids).lower(),
-                "is_anchored": str(nid in anchored_ids).lower(),
-                "is_excluded": str(nid in excluded_ids).lower(),
-                "path_depth": depths.get(nid, 0),
-                "sampling_params": json_str(n.get("sampling_params")),
-                "usage": json_str(n.get("usage")),
-                "logprobs": json_str(n.get("logprobs")),
-                "context_usage": json_str(n.get("context_usage")),
-            })
+            writer.writerow((
+                nid,
+                n.get("parent_id") or "",
+                n["role"],
+                n["content"],
+                n.get("edited_content") or "",
+                n.get("model") or "",
+                n.get("provider") or "",
+                n.get("latency_ms") or "",
+                n.get("finish_reason") or "",
+                n.get("thinking_content") or "",
+                n.get("created_at") or "",
+                ",".join(tags_by_node.get(nid, [])),
+                str(nid in bookmarked_ids).lower(),
+                str(nid in anchored_ids).lower(),
+                str(nid in excluded_ids).lower(),
+                depths.get(nid, 0),
+                json_str(n.get("sampling_params")),
+                json_str(n.get("usage")),
+                json_str(n.get("logprobs")),
+                json_str(n.get("context_usage")),
+            ))
 
         return output.getvalue()
 
@@ -1,7 +1,7 @@
 """Rhizome service: coordinates EventStore and StateProjector for rhizome/node operations."""
 
 from collections import defaultdict
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from uuid import uuid4
 
@@ -78,6 +78,13 @@ class RhizomeService:
         self._db = db
         self._summary_client = summary_client
 
+    async def _emit(self, events: list[EventEnvelope]) -> None:
+        """Append events in one transaction, then project them in one call."""
+        if not events:
+            return
+        await self._store.append_many(events)
+        await self._projector.project(events)
+
     async def create_rhizome(self, request: CreateRhizomeRequest) -> RhizomeDetailResponse:
         """Create a new rhizome. Emits RhizomeCreated, projects, returns the rhizome."""
         rhizome_id = str(uuid4())
@@ -100,8 +107,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         rhizome = await self._projector.get_rhizome(rhizome_id)
         assert rhizome is not None
@@ -153,10 +159,7 @@ class RhizomeService:
             )
             events.append(event)
 
-        for event in events:
-            await self._store.append(event)
-        if events:
-            await self._projector.project(events)
+        await self._emit(events)
 
         # Read back the full rhizome with nodes
         updated_rhizome = await self._projector.get_rhizome(rhizome_id)
@@ -267,8 +270,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         updated = await self._projector.get_rhizome(rhizome_id)
         assert updated is not None
@@ -292,8 +294,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         updated = await self._projector.get_rhizome(rhizome_id)
         assert updated is not None
@@ -334,8 +335,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         # Read back the projected node with sibling info
         nodes = await self._projector.get_nodes(rhizome_id)
@@ -343,6 +343,55 @@ class RhizomeService:
         node_row = next(n for n in nodes if n["node_id"] == node_id)
         return self._node_from_row(node_row, sibling_info=sibling_info)
 
+    async def create_node_chain(
+        self,
+        rhizome_id: str,
+        messages: list[tuple[str, str]],
+        parent_id: str | None = None,
+    ) -> list[str]:
+        """Append a linear chain of (role, content) messages below parent_id.
+
+        All NodeCreated events are written in one transaction and projected
+        together. Each event gets its own, strictly increasing timestamp so
+        the chain keeps its order when nodes are read back by created_at.
+        Returns the new node_ids in chain order.
+        """
+        rhizome = await self._projector.get_rhizome(rhizome_id)
+        if rhizome is None:
+            raise RhizomeNotFoundError(rhizome_id)
+
+        if parent_id is not None:
+            nodes = await self._projector.get_nodes(rhizome_id)
+            if parent_id not in {n["node_id"] for n in nodes}:
+                raise InvalidParentError(parent_id)
+
+        now = datetime.now(UTC)
+        events: list[EventEnvelope] = []
+        node_ids: list[str] = []
+        for i, (role, content) in enumerate(messages):
+            request = CreateNodeRequest(role=role, content=content, parent_id=parent_id)
+            node_id = str(uuid4())
+            payload = NodeCreatedPayload(
+                node_id=node_id,
+                parent_id=request.parent_id,
+                role=request.role,
+                content=request.content,
+                mode=request.mode,
+            )
+            events.append(EventEnvelope(
+                event_id=str(uuid4()),
+                rhizome_id=rhizome_id,
+                timestamp=now + timedelta(microseconds=i),
+                device_id="local",
+                event_type="NodeCreated",
+                payload=payload.model_dump(),
+            ))
+            node_ids.append(node_id)
+            parent_id = node_id
+
+        await self._emit(events)
+        return node_ids
+
     async def edit_node_content(
         self, rhizome_id: str, node_id: str, edited_content: str | None,
     ) -> NodeResponse:
@@ -382,8 +431,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         # Read back with sibling info
         nodes = await self._projector.get_nodes(rhizome_id)
@@ -505,8 +553,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         row = await self._db.fetchone(
             "SELECT * FROM annotations WHERE annotation_id = ?",
@@ -540,8 +587,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
     async def get_node_annotations(
         self, rhizome_id: str, node_id: str,
@@ -606,8 +652,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         row = await self._db.fetchone(
             "SELECT * FROM notes WHERE note_id = ?",
@@ -638,8 +683,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
     async def get_node_notes(
         self, rhizome_id: str, node_id: str,
@@ -710,8 +754,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         row = await self._db.fetchone(
             "SELECT * FROM bookmarks WHERE bookmark_id = ?",
@@ -742,8 +785,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
     async def get_rhizome_bookmarks(
         self, rhizome_id: str, query: str | None = None,
@@ -893,8 +935,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         updated_row = await self._db.fetchone(
             "SELECT * FROM bookmarks WHERE bookmark_id = ?",
@@ -990,8 +1031,7 @@ class RhizomeService:
             event_type="SummaryGenerated",
             payload=payload.model_dump(),
         )
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         return self._summary_from_row(
             await self._db.fetchone(
@@ -1025,8 +1065,7 @@ class RhizomeService:
             event_type="SummaryRemoved",
             payload=payload.model_dump(),
         )
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
     @staticmethod
     def _summary_from_row(row) -> SummaryResponse:
@@ -1107,8 +1146,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         return NodeExclusionResponse(
             rhizome_id=rhizome_id,
@@ -1136,8 +1174,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
     async def get_rhizome_exclusions(
         self, rhizome_id: str,
@@ -1189,8 +1226,7 @@ class RhizomeService:
                 event_type="NodeUnanchored",
                 payload=payload.model_dump(),
             )
-            await self._store.append(event)
-            await self._projector.project([event])
+            await self._emit([event])
             return False
         else:
             # Anchor
@@ -1203,8 +1239,7 @@ class RhizomeService:
                 event_type="NodeAnchored",
                 payload=payload.model_dump(),
             )
-            await self._store.append(event)
-            await self._projector.project([event])
+            await self._emit([event])
             return True
 
     async def bulk_anchor(
@@ -1253,10 +1288,7 @@ class RhizomeService:
                     payload=payload.model_dump(),
                 ))
 
-        for event in events:
-            await self._store.append(event)
-        if events:
-            await self._projector.project(events)
+        await self._emit(events)
 
         return len(events)
 
@@ -1305,8 +1337,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         return DigressionGroupResponse(
             group_id=group_id,
@@ -1359,8 +1390,7 @@ class RhizomeService:
             payload=payload.model_dump(),
         )
 
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
         # Read back with member nodes
         groups = await self._projector.get_digression_groups(rhizome_id)
@@ -1409,8 +1439,7 @@ class RhizomeService:
             event_type="PerturbationReportRemoved",
             payload=payload.model_dump(),
         )
-        await self._store.append(event)
-        await self._projector.project([event])
+        await self._emit([event])
 
     @staticmethod
     def _perturbation_report_from_row(row: dict) -> PerturbationReportResponse:
@@ -1,5 +1,6 @@
 """Full-text search service using SQLite FTS5."""
 
+import functools
 import logging
 
 from qivis.db.connection import Database
@@ -8,6 +9,78 @@ from qivis.search.schemas import SearchResponse, SearchResultItem
 logger = logging.getLogger(__name__)
 
 
+def _in_clause(column: str, count: int) -> str:
+    placeholders = ", ".join("?" for _ in range(count))
+    return f"AND {column} IN ({placeholders})"
+
+
+@functools.lru_cache(maxsize=256)
+def _build_search_sql(
+    n_rhizome_ids: int,
+    n_models: int,
+    n_providers: int,
+    n_roles: int,
+    n_tags: int,
+    has_date_from: bool,
+    has_date_to: bool,
+    include_snippet: bool = True,
+) -> str:
+    """Build the search SQL for a given filter shape.
+
+    The text depends only on which filters are present and how many values
+    each carries, so it is built once per shape. Returning the identical
+    string also lets sqlite3's per-connection statement cache reuse the
+    prepared statement instead of re-parsing it.
+    """
+    clauses: list[str] = []
+    if n_rhizome_ids:
+        clauses.append(_in_clause("n.rhizome_id", n_rhizome_ids))
+    if n_models:
+        clauses.append(_in_clause("n.model", n_models))
+    if n_providers:
+        clauses.append(_in_clause("n.provider", n_providers))
+    if n_roles:
+        clauses.append(_in_clause("n.role", n_roles))
+    if n_tags:
+        placeholders = ", ".join("?" for _ in range(n_tags))
+        clauses.append(
+            f"AND n.node_id IN ("
+            f"SELECT DISTINCT node_id FROM annotations WHERE tag IN ({placeholders})"
+            f")"
+        )
+    if has_date_from:
+        clauses.append("AND n.created_at >= ?")
+    if has_date_to:
+        clauses.append("AND n.created_at <= ?")
+    filter_sql = "\n  ".join(clauses)
+    snippet_sql = (
+        "snippet(nodes_fts, 0, '[[mark]]', '[[/mark]]', '...', 40)"
+        if include_snippet else "''"
+    )
+
+    return f"""
+        SELECT
+            n.node_id,
+            n.rhizome_id,
+            n.role,
+            n.content,
+            n.model,
+            n.provider,
+            n.created_at,
+            t.title AS rhizome_title,
+            {snippet_sql} AS snippet
+        FROM nodes_fts
+        JOIN nodes n ON n.rowid = nodes_fts.rowid
+        JOIN rhizomes t ON t.rhizome_id = n.rhizome_id
+        WHERE nodes_fts MATCH ?
+          AND n.archived = 0
+          AND t.archived = 0
+          {filter_sql}
+        ORDER BY rank
+        LIMIT ?
+    """
+
+
 class SearchService:
     """Cross-rhizome full-text search over conversation nodes."""
 
@@ -26,77 +99,38 @@ class SearchService:
         date_from: str | None = None,
         date_to: str | None = None,
         limit: int = 50,
+        include_snippet: bool = True,
     ) -> SearchResponse:
-        """Search nodes by content and system_prompt with optional filters."""
+        """Search nodes by content and system_prompt with optional filters.
+
+        With include_snippet=False the FTS5 snippet() call is skipped and each
+        result's snippet is an empty string.
+        """
         fts_query = self._sanitize_query(query)
         if not fts_query:
             return SearchResponse(query=query, results=[], total=0)
 
-        # Build dynamic WHERE clauses and params
-        clauses: list[str] = []
+        # Bind params in the same order _build_search_sql emits placeholders
         params: list[str | int] = [fts_query]
-
-        if rhizome_ids:
-            placeholders = ", ".join("?" for _ in rhizome_ids)
-            clauses.append(f"AND n.rhizome_id IN ({placeholders})")
-            params.extend(rhizome_ids)
-
-        if models:
-            placeholders = ", ".join("?" for _ in models)
-            clauses.append(f"AND n.model IN ({placeholders})")
-            params.extend(models)
-
-        if providers:
-            placeholders = ", ".join("?" for _ in providers)
-            clauses.append(f"AND n.provider IN ({placeholders})")
-            params.extend(providers)
-
-        if roles:
-            placeholders = ", ".join("?" for _ in roles)
-            clauses.append(f"AND n.role IN ({placeholders})")
-            params.extend(roles)
-
-        if tags:
-            placeholders = ", ".join("?" for _ in tags)
-            clauses.append(
-                f"AND n.node_id IN ("
-                f"SELECT DISTINCT node_id FROM annotations WHERE tag IN ({placeholders})"
-                f")"
-            )
-            params.extend(tags)
-
+        for values in (rhizome_ids, models, providers, roles, tags):
+            if values:
+                params.extend(values)
         if date_from:
-            clauses.append("AND n.created_at >= ?")
             params.append(date_from)
-
         if date_to:
-            clauses.append("AND n.created_at <= ?")
             params.append(date_to)
-
         params.append(limit)
-        filter_sql = "\n  ".join(clauses)
-
-        sql = f"""
-            SELECT
-                n.node_id,
-                n.rhizome_id,
-                n.role,
-                n.content,
-                n.model,
-                n.provider,
-                n.created_at,
-                t.title AS rhizome_title,
-                snippet(nodes_fts, 0, '[[mark]]', '[[/mark]]', '...', 40) AS snippet
-            FROM nodes_fts
-            JOIN nodes n ON n.rowid = nodes_fts.rowid
-            JOIN rhizomes t ON t.rhizome_id = n.rhizome_id
-            WHERE nodes_fts MATCH ?
-              AND n.archived = 0
-              AND t.archived = 0
-              {filter_sql}
-            ORDER BY rank
-            LIMIT ?
-        """
+
+        sql = _build_search_sql(
+            len(rhizome_ids or ()),
+            len(models or ()),
+            len(providers or ()),
+            len(roles or ()),
+            len(tags or ()),
+            bool(date_from),
+            bool(date_to),
+            include_snippet,
+        )
 
         rows = await self._db.fetchall(sql, tuple(params))
 
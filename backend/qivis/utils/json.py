@@ -4,9 +4,31 @@ Replaces scattered _parse_json_field(), maybe_json(), _parse_json_or_raw(),
 and _json_str() with consistent, well-typed functions.
 """
 
+import functools
 import json
 from typing import Any
 
+# Bound once instead of going through json.loads/json.dumps argument handling
+# on every call. Both keep the stdlib defaults, including ", "/": " separators.
+_decode = json.JSONDecoder().decode
+_encode = json.JSONEncoder().encode
+
+# Characters a JSON document can start with, including the NaN/Infinity
+# extensions json.loads accepts. Anything else fails to parse, so callers
+# can reject it without raising and catching a JSONDecodeError.
+_JSON_START_CHARS = frozenset('{["-tfnNI0123456789')
+
+# rhizomes.metadata defaults to '{}', so this is the commonest "empty" value.
+_EMPTY_OBJECT_TEXT = frozenset(("{}", "{ }"))
+
+# Empty containers always encode the same way; skip the encoder for them.
+_EMPTY_CONTAINER_TEXT = {list: "[]", dict: "{}"}
+
+
+def _could_be_json(raw: str) -> bool:
+    stripped = raw.lstrip()
+    return bool(stripped) and stripped[0] in _JSON_START_CHARS
+
 
 def parse_json_field(raw: str | dict | None) -> dict[str, Any] | None:
     """Parse a JSON string or dict, returning None on failure or empty.
@@ -14,19 +36,17 @@ def parse_json_field(raw: str | dict | None) -> dict[str, Any] | None:
     For metadata, sampling_params, and other dict-valued DB fields.
     Returns None for: None, empty string, empty dict, invalid JSON, non-dict JSON.
     """
-    if raw is None:
-        return None
-    if isinstance(raw, dict):
-        return raw if raw else None
     if isinstance(raw, str):
-        if not raw:
+        # Only an object literal can yield a dict; skip the parse for anything else.
+        if raw in _EMPTY_OBJECT_TEXT or not raw.lstrip().startswith("{"):
             return None
         try:
-            parsed = json.loads(raw)
-            if isinstance(parsed, dict) and parsed:
-                return parsed
-        except (ValueError, TypeError):
-            pass
+            parsed = _decode(raw)
+        except ValueError:
+            return None
+        return parsed if isinstance(parsed, dict) and parsed else None
+    if isinstance(raw, dict):
+        return raw if raw else None
     return None
 
 
@@ -37,17 +57,15 @@ def parse_json_or_none(raw: str | dict | list | None) -> dict | list | None:
     Accepts dicts and lists as-is without re-parsing.
     Returns None for: None, empty string, invalid JSON.
     """
-    if raw is None:
-        return None
-    if isinstance(raw, (dict, list)):
-        return raw
     if isinstance(raw, str):
-        if not raw:
+        if not _could_be_json(raw):
             return None
         try:
-            return json.loads(raw)
-        except (ValueError, TypeError):
+            return _decode(raw)
+        except ValueError:
             return None
+    if isinstance(raw, (dict, list)):
+        return raw
     return None
 
 
@@ -60,9 +78,25 @@ def json_str(value: str | dict | list | None) -> str:
     if value is None:
         return ""
     if isinstance(value, str):
-        try:
-            parsed = json.loads(value)
-            return json.dumps(parsed)
-        except (ValueError, TypeError):
+        if not _could_be_json(value):
             return value
-    return json.dumps(value)
+        if len(value) <= _NORMALIZE_CACHE_MAX_LEN:
+            return _normalize_json_text_cached(value)
+        return _normalize_json_text(value)
+    if not value and type(value) in _EMPTY_CONTAINER_TEXT:
+        return _EMPTY_CONTAINER_TEXT[type(value)]
+    return _encode(value)
+
+
+def _normalize_json_text(value: str) -> str:
+    try:
+        return _encode(_decode(value))
+    except ValueError:
+        return value
+
+
+# Export rows repeat the same few short sampling_params strings. Only inputs up
+# to this length are cached, so large per-node values such as logprobs are
+# never kept alive by the cache.
+_NORMALIZE_CACHE_MAX_LEN = 256
+_normalize_json_text_cached = functools.lru_cache(maxsize=1024)(_normalize_json_text)
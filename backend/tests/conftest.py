@@ -1,44 +1,122 @@
-"""Shared pytest fixtures for Qivis tests."""
+"""Shared pytest fixtures for Qivis tests.
+
+By default every test gets its own database. Modules marked ``shared_db``
+share one database (and one client) per module instead; its tables are
+wiped after every test.
+"""
+
+import contextlib
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
-from qivis.db.connection import Database
 from qivis.events.projector import StateProjector
 from qivis.events.store import EventStore
-from qivis.main import app
-from qivis.rhizomes.router import get_rhizome_service
 from qivis.rhizomes.service import RhizomeService
+from tests.fixtures import (
+    close_schema_template,
+    connect_test_db,
+    override_dependencies,
+    reset_test_db,
+)
 
 
-@pytest.fixture
-async def db():
-    """In-memory database for tests."""
-    database = await Database.connect(":memory:")
+def _uses_shared_db(request) -> bool:
+    return request.node.get_closest_marker("shared_db") is not None
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def _schema_template():
+    """Close the per-process schema template once the session ends."""
+    yield
+    await close_schema_template()
+
+
+@pytest_asyncio.fixture
+async def _fresh_db():
+    database = await connect_test_db()
     yield database
     await database.close()
 
 
+@pytest_asyncio.fixture(scope="module")
+async def _module_db():
+    """The database shared by every test in a shared_db module."""
+    database = await connect_test_db()
+    yield database
+    await database.close()
+
+
+@pytest_asyncio.fixture
+async def _wipe_module_db(_module_db):
+    yield
+    await reset_test_db(_module_db)
+
+
+@pytest.fixture(autouse=True)
+def _reset_shared_db(request):
+    """In shared_db modules, wipe the tables after every test, whatever it requested."""
+    if _uses_shared_db(request):
+        request.getfixturevalue("_wipe_module_db")
+
+
 @pytest.fixture
-async def event_store(db):
+def db(request):
+    """In-memory database for tests, opened with the fast test pragmas."""
+    if _uses_shared_db(request):
+        return request.getfixturevalue("_module_db")
+    return request.getfixturevalue("_fresh_db")
+
+
+@pytest.fixture
+def event_store(db):
     """EventStore backed by in-memory database."""
     return EventStore(db)
 
 
 @pytest.fixture
-async def projector(db):
+def projector(db):
     """StateProjector backed by in-memory database."""
     return StateProjector(db)
 
 
-@pytest.fixture
-async def client(db):
-    """Async test client with in-memory DB wired into the app."""
-    service = RhizomeService(db)
-    app.dependency_overrides[get_rhizome_service] = lambda: service
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test",
-    ) as client:
+@pytest.fixture(scope="module")
+def app_overrides():
+    """Extra dependency overrides for the shared_db client; modules override this."""
+    return {}
+
+
+@contextlib.asynccontextmanager
+async def _app_client(database, overrides):
+    # Imported here so modules that never request a client skip loading the app.
+    from qivis.main import app
+    from qivis.rhizomes.router import get_rhizome_service
+
+    service = RhizomeService(database)
+    with override_dependencies(app, {get_rhizome_service: lambda: service, **overrides}):
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            yield client
+
+
+@pytest_asyncio.fixture
+async def _fresh_client(_fresh_db):
+    async with _app_client(_fresh_db, {}) as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="module")
+async def _module_client(_module_db, app_overrides):
+    async with _app_client(_module_db, app_overrides) as client:
         yield client
-    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def client(request):
+    """Async test client with the test database wired into the app."""
+    if _uses_shared_db(request):
+        return request.getfixturevalue("_module_client")
+    return request.getfixturevalue("_fresh_client")
@@ -1,11 +1,18 @@
 """Shared test helpers. Grows with each subphase."""
 
-from datetime import UTC, datetime
-from typing import Any, Literal
-from uuid import uuid4
+import contextlib
+import os
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING, Any, Literal
+from uuid import UUID, uuid4
 
 from httpx import AsyncClient
 
+from qivis.db.connection import Database
+from qivis.events.projector import StateProjector
+from qivis.events.store import EventStore
+
 from qivis.models import (
     AnnotationAddedPayload,
     AnnotationRemovedPayload,
@@ -31,6 +38,29 @@ from qivis.models import (
     SummaryGeneratedPayload,
     SummaryRemovedPayload,
 )
+from qivis.providers.base import LLMProvider
+from qivis.providers.registry import clear_providers, get_all_providers, register_provider
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+
+def _envelope(rhizome_id: str, event_type: str, payload: dict[str, Any]) -> EventEnvelope:
+    """Wrap an already-validated payload without re-validating the envelope."""
+    return EventEnvelope.model_construct(
+        event_id=str(uuid4()),
+        rhizome_id=rhizome_id,
+        timestamp=datetime.now(UTC),
+        device_id="test",
+        event_type=event_type,
+        payload=payload,
+    )
+
+
+# Validated once at import; the helpers below copy them and fill in the
+# per-call fields. Calls with payload overrides still validate in full.
+_RHIZOME_CREATED_TEMPLATE = RhizomeCreatedPayload(title="").model_dump()
+_NODE_CREATED_TEMPLATE = NodeCreatedPayload(node_id="", role="user", content="").model_dump()
 
 
 def make_rhizome_created_envelope(
@@ -43,21 +73,24 @@ def make_rhizome_created_envelope(
 ) -> EventEnvelope:
     """Create a RhizomeCreated EventEnvelope for testing."""
     rhizome_id = rhizome_id or str(uuid4())
-    payload = RhizomeCreatedPayload(
-        title=title,
-        default_model=default_model,
-        default_provider=default_provider,
-        default_system_prompt=default_system_prompt,
-        **payload_overrides,
-    )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="RhizomeCreated",
-        payload=payload.model_dump(),
-    )
+    if payload_overrides:
+        payload = RhizomeCreatedPayload(
+            title=title,
+            default_model=default_model,
+            default_provider=default_provider,
+            default_system_prompt=default_system_prompt,
+            **payload_overrides,
+        ).model_dump()
+    else:
+        payload = {
+            **_RHIZOME_CREATED_TEMPLATE,
+            "title": title,
+            "default_model": default_model,
+            "default_provider": default_provider,
+            "default_system_prompt": default_system_prompt,
+            "metadata": {},
+        }
+    return _envelope(rhizome_id, "RhizomeCreated", payload)
 
 
 def make_node_created_envelope(
@@ -70,21 +103,55 @@ def make_node_created_envelope(
 ) -> EventEnvelope:
     """Create a NodeCreated EventEnvelope for testing."""
     node_id = node_id or str(uuid4())
-    payload = NodeCreatedPayload(
-        node_id=node_id,
-        parent_id=parent_id,
-        role=role,
-        content=content,
-        **payload_overrides,
-    )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NodeCreated",
-        payload=payload.model_dump(),
-    )
+    if payload_overrides:
+        payload = NodeCreatedPayload(
+            node_id=node_id,
+            parent_id=parent_id,
+            role=role,
+            content=content,
+            **payload_overrides,
+        ).model_dump()
+    else:
+        payload = {
+            **_NODE_CREATED_TEMPLATE,
+            "node_id": node_id,
+            "parent_id": parent_id,
+            "role": role,
+            "content": content,
+        }
+    return _envelope(rhizome_id, "NodeCreated", payload)
+
+
+def make_node_chain_envelopes(
+    rhizome_id: str,
+    specs: list[dict[str, Any]],
+    parent_id: str | None = None,
+    timestamp: datetime | None = None,
+) -> list[EventEnvelope]:
+    """Create NodeCreated envelopes for a linear chain, each parented on the last.
+
+    Each spec holds NodeCreatedPayload fields (role, content, ...). IDs come
+    from one os.urandom call. Node i is stamped one microsecond after node
+    i - 1, so the chain reads back in order when sorted by created_at.
+    """
+    timestamp = timestamp or datetime.now(UTC)
+    raw = os.urandom(32 * len(specs))
+    ids = [str(UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, len(raw), 16)]
+
+    envelopes = []
+    for i, spec in enumerate(specs):
+        event_id, node_id = ids[2 * i], ids[2 * i + 1]
+        payload = NodeCreatedPayload(node_id=node_id, parent_id=parent_id, **spec)
+        envelopes.append(EventEnvelope.model_construct(
+            event_id=event_id,
+            rhizome_id=rhizome_id,
+            timestamp=timestamp + timedelta(microseconds=i),
+            device_id="test",
+            event_type="NodeCreated",
+            payload=payload.model_dump(),
+        ))
+        parent_id = node_id
+    return envelopes
 
 
 def make_full_node_created_envelope(rhizome_id: str, parent_id: str | None = None) -> EventEnvelope:
@@ -117,14 +184,7 @@ def make_full_node_created_envelope(rhizome_id: str, parent_id: str | None = Non
         participant_id=None,
         participant_name=None,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NodeCreated",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NodeCreated", payload.model_dump())
 
 
 def make_node_content_edited_envelope(
@@ -139,14 +199,7 @@ def make_node_content_edited_envelope(
         original_content=original_content,
         new_content=new_content,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NodeContentEdited",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NodeContentEdited", payload.model_dump())
 
 
 def make_rhizome_metadata_updated_envelope(
@@ -161,16 +214,208 @@ def make_rhizome_metadata_updated_envelope(
         old_value=old_value,
         new_value=new_value,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="RhizomeMetadataUpdated",
-        payload=payload.model_dump(),
+    return _envelope(rhizome_id, "RhizomeMetadataUpdated", payload.model_dump())
+
+
+# -- Database helpers --
+
+# Durability is irrelevant for throwaway test databases.
+FAST_TEST_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA locking_mode=EXCLUSIVE",
+)
+
+
+# Schema-initialised database that connect_test_db copies from, built on
+# first use so the DDL and migrations run once per process, not per test.
+_schema_template: Database | None = None
+
+
+async def connect_test_db() -> Database:
+    """Open a uniquely named shared-cache in-memory database with fast pragmas."""
+    global _schema_template
+    if _schema_template is None:
+        _schema_template = await Database.connect(":memory:")
+    db = await _schema_template.copy_to(
+        f"file:qivis_test_{uuid4().hex}?mode=memory&cache=shared", uri=True,
+    )
+    for pragma in FAST_TEST_PRAGMAS:
+        await db.execute(pragma)
+    return db
+
+
+async def close_schema_template() -> None:
+    """Close the template behind connect_test_db, if one was opened."""
+    global _schema_template
+    if _schema_template is not None:
+        await _schema_template.close()
+        _schema_template = None
+
+
+# Everything a test can write to: projections first, then the event log.
+RESETTABLE_TABLES = (
+    "annotations",
+    "bookmarks",
+    "node_exclusions",
+    "digression_group_nodes",
+    "digression_groups",
+    "node_anchors",
+    "notes",
+    "summaries",
+    "perturbation_reports",
+    "nodes",
+    "rhizomes",
+    "events",
+)
+# executescript runs each statement in autocommit, so wrap them in one transaction.
+_RESET_SCRIPT = (
+    "BEGIN;"
+    + "".join(f"DELETE FROM {table};" for table in RESETTABLE_TABLES)
+    + "COMMIT;"
+)
+
+
+async def reset_test_db(db: Database) -> None:
+    """Delete all events and projected rows, keeping the schema (FTS follows via triggers)."""
+    await db.executescript(_RESET_SCRIPT)
+
+
+async def append_and_project(
+    event_store: EventStore,
+    projector: StateProjector,
+    events: list[EventEnvelope],
+) -> None:
+    """Append events in one transaction, then project them in one call."""
+    await event_store.append_many(events)
+    await projector.project(events)
+
+
+@contextlib.contextmanager
+def override_dependencies(
+    app: FastAPI, overrides: dict[Callable[..., Any], Callable[..., Any]],
+) -> Iterator[None]:
+    """Install dependency overrides on app, restoring only those keys on exit."""
+    missing = object()
+    previous = {dep: app.dependency_overrides.get(dep, missing) for dep in overrides}
+    app.dependency_overrides.update(overrides)
+    try:
+        yield
+    finally:
+        for dep, old in previous.items():
+            if old is missing:
+                app.dependency_overrides.pop(dep, None)
+            else:
+                app.dependency_overrides[dep] = old
+
+
+@contextlib.contextmanager
+def registered_providers(*providers: LLMProvider) -> Iterator[None]:
+    """Make providers the only registered ones, restoring the previous registry on exit."""
+    previous = get_all_providers()
+    clear_providers()
+    for provider in providers:
+        register_provider(provider)
+    try:
+        yield
+    finally:
+        clear_providers()
+        for provider in previous:
+            register_provider(provider)
+
+
+@contextlib.asynccontextmanager
+async def fts_deferred(db: Database):
+    """Suspend the nodes_fts sync triggers for a bulk seed, then rebuild the index once."""
+    triggers = await db.fetchall(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type = 'trigger' AND name LIKE 'nodes_fts_%'"
+    )
+    for trigger in triggers:
+        await db.execute(f"DROP TRIGGER {trigger['name']}")
+    try:
+        yield
+    finally:
+        for trigger in triggers:
+            await db.execute(trigger["sql"])
+        await db.execute("INSERT INTO nodes_fts(nodes_fts) VALUES('rebuild')")
+
+
+async def seed_rhizome(
+    event_store: EventStore,
+    projector: StateProjector,
+    *,
+    rhizome_id: str | None = None,
+    title: str = "Test Rhizome",
+    nodes: list[dict] | None = None,
+) -> dict:
+    """Create a rhizome with a linear chain of nodes via events. Returns {rhizome_id, node_ids}.
+
+    All events are appended in one transaction and projected together.
+    """
+    tree_ev = make_rhizome_created_envelope(rhizome_id=rhizome_id, title=title)
+    node_evs = make_node_chain_envelopes(tree_ev.rhizome_id, nodes or [])
+    events = [tree_ev, *node_evs]
+    node_ids = [ev.payload["node_id"] for ev in node_evs]
+
+    await append_and_project(event_store, projector, events)
+
+    return {"rhizome_id": tree_ev.rhizome_id, "node_ids": node_ids}
+
+
+async def seed_linear_branch(
+    event_store: EventStore,
+    projector: StateProjector,
+    n_messages: int = 4,
+    title: str = "Test Rhizome",
+) -> dict:
+    """Event-level counterpart of create_rhizome_with_messages, same return shape.
+
+    Seeds N alternating user/assistant messages in one append and one projection.
+    """
+    return await seed_rhizome(
+        event_store, projector,
+        title=title,
+        nodes=[
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i + 1}"}
+            for i in range(n_messages)
+        ],
     )
 
 
+async def add_node(
+    event_store: EventStore,
+    projector: StateProjector,
+    rhizome_id: str,
+    content: str,
+    role: Literal["system", "user", "assistant", "tool", "researcher_note"] = "user",
+    parent_id: str | None = None,
+) -> str:
+    """Add a single node via events. Returns the new node_id."""
+    node_ev = make_node_created_envelope(
+        rhizome_id=rhizome_id, parent_id=parent_id, role=role, content=content,
+    )
+    await append_and_project(event_store, projector, [node_ev])
+    return node_ev.payload["node_id"]
+
+
+async def seed_annotation(
+    event_store: EventStore,
+    projector: StateProjector,
+    rhizome_id: str,
+    node_id: str,
+    tag: str,
+    value: str | None = None,
+) -> None:
+    """Add an annotation to a node."""
+    ann_ev = make_annotation_added_envelope(
+        rhizome_id=rhizome_id, node_id=node_id, tag=tag, value=value,
+    )
+    await append_and_project(event_store, projector, [ann_ev])
+
+
 # -- API-level helpers (available from Phase 0.3 onward) --
 
 
@@ -238,14 +483,7 @@ def make_annotation_added_envelope(
         value=value,
         notes=notes,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="AnnotationAdded",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "AnnotationAdded", payload.model_dump())
 
 
 def make_annotation_removed_envelope(
@@ -258,14 +496,7 @@ def make_annotation_removed_envelope(
         annotation_id=annotation_id,
         reason=reason,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="AnnotationRemoved",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "AnnotationRemoved", payload.model_dump())
 
 
 def make_bookmark_created_envelope(
@@ -283,14 +514,7 @@ def make_bookmark_created_envelope(
         label=label,
         notes=notes,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="BookmarkCreated",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "BookmarkCreated", payload.model_dump())
 
 
 def make_bookmark_removed_envelope(
@@ -301,14 +525,7 @@ def make_bookmark_removed_envelope(
     payload = BookmarkRemovedPayload(
         bookmark_id=bookmark_id,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="BookmarkRemoved",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "BookmarkRemoved", payload.model_dump())
 
 
 def make_bookmark_summary_generated_envelope(
@@ -325,14 +542,7 @@ def make_bookmark_summary_generated_envelope(
         model=model,
         summarized_node_ids=summarized_node_ids or [],
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="BookmarkSummaryGenerated",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "BookmarkSummaryGenerated", payload.model_dump())
 
 
 def make_node_context_excluded_envelope(
@@ -347,14 +557,7 @@ def make_node_context_excluded_envelope(
         scope_node_id=scope_node_id,
         reason=reason,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NodeContextExcluded",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NodeContextExcluded", payload.model_dump())
 
 
 def make_node_context_included_envelope(
@@ -367,14 +570,7 @@ def make_node_context_included_envelope(
         node_id=node_id,
         scope_node_id=scope_node_id,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NodeContextIncluded",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NodeContextIncluded", payload.model_dump())
 
 
 def make_digression_group_created_envelope(
@@ -392,14 +588,7 @@ def make_digression_group_created_envelope(
         label=label,
         excluded_by_default=excluded_by_default,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="DigressionGroupCreated",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "DigressionGroupCreated", payload.model_dump())
 
 
 def make_digression_group_toggled_envelope(
@@ -412,14 +601,7 @@ def make_digression_group_toggled_envelope(
         group_id=group_id,
         included=included,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="DigressionGroupToggled",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "DigressionGroupToggled", payload.model_dump())
 
 
 def make_node_anchored_envelope(
@@ -428,14 +610,7 @@ def make_node_anchored_envelope(
 ) -> EventEnvelope:
     """Create a NodeAnchored EventEnvelope for testing."""
     payload = NodeAnchoredPayload(node_id=node_id)
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NodeAnchored",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NodeAnchored", payload.model_dump())
 
 
 def make_node_unanchored_envelope(
@@ -444,14 +619,7 @@ def make_node_unanchored_envelope(
 ) -> EventEnvelope:
     """Create a NodeUnanchored EventEnvelope for testing."""
     payload = NodeUnanchoredPayload(node_id=node_id)
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NodeUnanchored",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NodeUnanchored", payload.model_dump())
 
 
 def make_note_added_envelope(
@@ -467,14 +635,7 @@ def make_note_added_envelope(
         node_id=node_id,
         content=content,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NoteAdded",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NoteAdded", payload.model_dump())
 
 
 def make_note_removed_envelope(
@@ -487,14 +648,7 @@ def make_note_removed_envelope(
         note_id=note_id,
         reason=reason,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="NoteRemoved",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "NoteRemoved", payload.model_dump())
 
 
 def make_summary_generated_envelope(
@@ -520,14 +674,7 @@ def make_summary_generated_envelope(
         summary_type=summary_type,
         prompt_used=prompt_used,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="SummaryGenerated",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "SummaryGenerated", payload.model_dump())
 
 
 def make_summary_removed_envelope(
@@ -540,14 +687,7 @@ def make_summary_removed_envelope(
         summary_id=summary_id,
         reason=reason,
     )
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="SummaryRemoved",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "SummaryRemoved", payload.model_dump())
 
 
 def make_rhizome_archived_envelope(
@@ -556,14 +696,7 @@ def make_rhizome_archived_envelope(
 ) -> EventEnvelope:
     """Create a RhizomeArchived EventEnvelope for testing."""
     payload = RhizomeArchivedPayload(reason=reason)
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="RhizomeArchived",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "RhizomeArchived", payload.model_dump())
 
 
 def make_rhizome_unarchived_envelope(
@@ -571,14 +704,7 @@ def make_rhizome_unarchived_envelope(
 ) -> EventEnvelope:
     """Create a RhizomeUnarchived EventEnvelope for testing."""
     payload = RhizomeUnarchivedPayload()
-    return EventEnvelope(
-        event_id=str(uuid4()),
-        rhizome_id=rhizome_id,
-        timestamp=datetime.now(UTC),
-        device_id="test",
-        event_type="RhizomeUnarchived",
-        payload=payload.model_dump(),
-    )
+    return _envelope(rhizome_id, "RhizomeUnarchived", payload.model_dump())
 
 
 async def create_branching_rhizome(client: AsyncClient) -> dict:
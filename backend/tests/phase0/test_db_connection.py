@@ -40,6 +40,39 @@ class TestDatabaseConnection:
             finally:
                 await db.close()
 
+    async def test_connect_accepts_uri_filename(self):
+        """uri=True opens a named shared-cache in-memory database."""
+        db = await Database.connect("file:qivis_uri_test?mode=memory&cache=shared", uri=True)
+        try:
+            row = await db.fetchone(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='rhizomes'"
+            )
+            assert row is not None
+            assert not os.path.exists("file:qivis_uri_test?mode=memory&cache=shared")
+        finally:
+            await db.close()
+
+    async def test_copy_to_clones_schema_and_rows(self):
+        """copy_to opens an independent copy with the schema, migrations and rows."""
+        source = await Database.connect(":memory:")
+        try:
+            tree_event = make_rhizome_created_envelope(title="Copied")
+            await StateProjector(source).project([tree_event])
+            copy = await source.copy_to(":memory:")
+            try:
+                migrations = await copy.fetchone("SELECT count(*) AS n FROM schema_migrations")
+                assert migrations["n"] > 0
+                tree = await StateProjector(copy).get_rhizome(tree_event.rhizome_id)
+                assert tree is not None
+                assert tree["title"] == "Copied"
+
+                await copy.execute("DELETE FROM rhizomes")
+                assert await StateProjector(source).get_rhizome(tree_event.rhizome_id)
+            finally:
+                await copy.close()
+        finally:
+            await source.close()
+
     async def test_foreign_keys_enabled(self):
         """Foreign keys are enforced."""
         db = await Database.connect(":memory:")
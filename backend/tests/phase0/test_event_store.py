@@ -60,6 +60,28 @@ class TestEventStoreAppend:
         with pytest.raises(Exception):  # IntegrityError
             await event_store.append(event)
 
+    async def test_append_many_preserves_order(self, event_store):
+        """append_many writes every event, in the order given."""
+        tree_event = make_rhizome_created_envelope()
+        node_events = [
+            make_node_created_envelope(rhizome_id=tree_event.rhizome_id, content=f"m{i}")
+            for i in range(3)
+        ]
+
+        await event_store.append_many([tree_event, *node_events])
+        events = await event_store.get_events(tree_event.rhizome_id)
+
+        assert [e.event_id for e in events] == [
+            e.event_id for e in [tree_event, *node_events]
+        ]
+
+    async def test_append_many_is_all_or_nothing(self, event_store):
+        """A duplicate event_id in the batch leaves the store unchanged."""
+        event = make_rhizome_created_envelope()
+        with pytest.raises(Exception):  # IntegrityError
+            await event_store.append_many([event, event])
+        assert await event_store.get_events(event.rhizome_id) == []
+
     async def test_event_payload_preserved_as_json(self, event_store):
         """Complex nested payload (SamplingParams inside TreeCreated) round-trips."""
         from qivis.models import SamplingParams, RhizomeCreatedPayload
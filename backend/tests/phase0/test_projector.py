@@ -10,6 +10,7 @@ from tests.fixtures import (
     make_full_node_created_envelope,
     make_node_created_envelope,
     make_rhizome_created_envelope,
+    seed_rhizome,
 )
 
 
@@ -124,6 +125,34 @@ class TestProjectorNodeFields:
         nodes = await projector.get_nodes(tree_event.rhizome_id)
         assert len(nodes) == 3
 
+    async def test_get_node_by_id(self, event_store, projector):
+        """get_node returns the single projected node, or None for unknown ids."""
+        tree_event = make_rhizome_created_envelope()
+        node_event = make_node_created_envelope(
+            rhizome_id=tree_event.rhizome_id, content="Only me",
+        )
+        await event_store.append(tree_event)
+        await event_store.append(node_event)
+        await projector.project([tree_event, node_event])
+
+        node = await projector.get_node(tree_event.rhizome_id, node_event.payload["node_id"])
+        assert node is not None
+        assert node["content"] == "Only me"
+        assert await projector.get_node(tree_event.rhizome_id, "missing") is None
+
+    async def test_seeded_chain_reads_back_in_order(self, event_store, projector):
+        """Each seeded chain node gets a later created_at, so get_nodes keeps chain order."""
+        seeded = await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user" if i % 2 == 0 else "assistant", "content": f"msg {i}"}
+            for i in range(8)
+        ])
+
+        nodes = await projector.get_nodes(seeded["rhizome_id"])
+        assert [n["node_id"] for n in nodes] == seeded["node_ids"]
+        created = [n["created_at"] for n in nodes]
+        assert created == sorted(created)
+        assert len(set(created)) == len(created)
+
 
 class TestProjectorEdgeCases:
     async def test_unknown_event_type_does_not_crash(self, event_store, projector):
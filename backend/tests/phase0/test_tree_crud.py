@@ -3,6 +3,13 @@
 Tests the API endpoints end-to-end: create rhizomes, add messages, retrieve.
 """
 
+import pytest
+
+from qivis.events.projector import StateProjector
+from qivis.events.store import EventStore
+from qivis.rhizomes.schemas import CreateRhizomeRequest
+from qivis.rhizomes.service import InvalidParentError, RhizomeService
+
 
 class TestCreateRhizome:
     async def test_create_rhizome_returns_correct_fields(self, client):
@@ -151,6 +158,48 @@ class TestCreateNode:
         assert resp.status_code == 400
 
 
+class TestCreateNodeChain:
+    async def test_chain_links_each_node_to_previous(self, db):
+        """create_node_chain parents each message on the one before it."""
+        service = RhizomeService(db)
+        rhizome = await service.create_rhizome(CreateRhizomeRequest(title="Chain"))
+        node_ids = await service.create_node_chain(rhizome.rhizome_id, [
+            ("user", "Hello"), ("assistant", "Hi"), ("user", "Bye"),
+        ])
+
+        detail = await service.get_rhizome(rhizome.rhizome_id)
+        assert detail is not None
+        by_id = {n.node_id: n for n in detail.nodes}
+        assert [by_id[nid].content for nid in node_ids] == ["Hello", "Hi", "Bye"]
+        assert by_id[node_ids[0]].parent_id is None
+        assert by_id[node_ids[1]].parent_id == node_ids[0]
+        assert by_id[node_ids[2]].parent_id == node_ids[1]
+
+    async def test_chain_invalid_parent(self, db):
+        """create_node_chain rejects an unknown parent_id without writing events."""
+        service = RhizomeService(db)
+        rhizome = await service.create_rhizome(CreateRhizomeRequest(title="Chain"))
+        with pytest.raises(InvalidParentError):
+            await service.create_node_chain(
+                rhizome.rhizome_id, [("user", "Hello")], parent_id="nope",
+            )
+        events = await EventStore(db).get_events(rhizome.rhizome_id)
+        assert [e.event_type for e in events] == ["RhizomeCreated"]
+
+    async def test_chain_nodes_read_back_in_order(self, db):
+        """Each chain node gets a later created_at, so get_nodes keeps chain order."""
+        service = RhizomeService(db)
+        rhizome = await service.create_rhizome(CreateRhizomeRequest(title="Chain"))
+        messages = [("user" if i % 2 == 0 else "assistant", f"msg {i}") for i in range(8)]
+        node_ids = await service.create_node_chain(rhizome.rhizome_id, messages)
+
+        nodes = await StateProjector(db).get_nodes(rhizome.rhizome_id)
+        assert [n["node_id"] for n in nodes] == node_ids
+        created = [n["created_at"] for n in nodes]
+        assert created == sorted(created)
+        assert len(set(created)) == len(created)
+
+
 class TestFullWorkflow:
     async def test_create_rhizome_add_messages_retrieve(self, client):
         """Integration: create rhizome, add messages, retrieve with all messages."""
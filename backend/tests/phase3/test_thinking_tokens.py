@@ -114,7 +114,6 @@ async def projector(db):
 
 
 class TestProjectorThinkingContent:
-    @pytest.mark.asyncio
     async def test_node_created_with_thinking_content_stores_and_retrieves(
         self, db, projector,
     ):
@@ -150,7 +149,6 @@ class TestProjectorThinkingContent:
         assert len(nodes) == 1
         assert nodes[0]["thinking_content"] == thinking
 
-    @pytest.mark.asyncio
     async def test_node_created_without_thinking_content(self, db, projector):
         """Nodes without thinking_content should have None."""
         rhizome_id = str(uuid4())
@@ -528,7 +526,6 @@ class TestContextBuilderThinking:
 
 
 class TestSchemaMigration:
-    @pytest.mark.asyncio
     async def test_migration_is_idempotent(self, db):
         """Running migration twice should not error (column already exists)."""
         from qivis.db.schema import run_migrations
@@ -537,7 +534,6 @@ class TestSchemaMigration:
         await run_migrations(db)
         await run_migrations(db)
 
-    @pytest.mark.asyncio
     async def test_thinking_content_column_exists(self, db):
         """The thinking_content column should exist after migration."""
         # Create rhizome first (FK constraint)
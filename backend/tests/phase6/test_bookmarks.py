@@ -11,6 +11,7 @@ import pytest
 
 from qivis.events.projector import StateProjector
 from qivis.events.store import EventStore
+from qivis.rhizomes.service import RhizomeService
 from tests.fixtures import (
     create_test_rhizome,
     create_rhizome_with_messages,
@@ -124,6 +125,37 @@ class TestBookmarkProjection:
         assert row["summary_model"] == "claude-haiku-4-5"
         assert node_id in row["summarized_node_ids"]
 
+    async def test_summarized_node_ids_stored_compact_and_read_back(
+        self, event_store, projector, db,
+    ):
+        """summarized_node_ids is stored as compact JSON that _bookmark_from_row parses back."""
+        tree_ev = make_rhizome_created_envelope()
+        first_ev = make_node_created_envelope(rhizome_id=tree_ev.rhizome_id, content="Hello")
+        second_ev = make_node_created_envelope(
+            rhizome_id=tree_ev.rhizome_id,
+            parent_id=first_ev.payload["node_id"],
+            role="assistant",
+            content="Hi",
+        )
+        node_ids = [first_ev.payload["node_id"], second_ev.payload["node_id"]]
+        bm_ev = make_bookmark_created_envelope(rhizome_id=tree_ev.rhizome_id, node_id=node_ids[-1])
+        summary_ev = make_bookmark_summary_generated_envelope(
+            rhizome_id=tree_ev.rhizome_id,
+            bookmark_id=bm_ev.payload["bookmark_id"],
+            summarized_node_ids=node_ids,
+        )
+        events = [tree_ev, first_ev, second_ev, bm_ev, summary_ev]
+        await event_store.append_many(events)
+        await projector.project(events)
+
+        row = await db.fetchone(
+            "SELECT * FROM bookmarks WHERE bookmark_id = ?",
+            (bm_ev.payload["bookmark_id"],),
+        )
+        assert row["summarized_node_ids"] == f'["{node_ids[0]}","{node_ids[1]}"]'
+        bookmark = RhizomeService._bookmark_from_row(dict(row))
+        assert bookmark.summarized_node_ids == node_ids
+
 
 # ---------------------------------------------------------------------------
 # API integration tests: bookmark CRUD
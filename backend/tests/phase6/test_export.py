@@ -225,6 +225,22 @@ class TestCsvExport:
         assert "content" in reader.fieldnames
         assert "created_at" in reader.fieldnames
 
+    async def test_csv_cells_line_up_with_headers(self, export_client):
+        """Each value lands under its own column header."""
+        data = await create_rhizome_with_messages(export_client, n_messages=2)
+        rhizome_id = data["rhizome_id"]
+        root_id, child_id = data["node_ids"]
+
+        resp = await export_client.get(f"/api/rhizomes/{rhizome_id}/export?format=csv")
+        rows = {r["node_id"]: r for r in csv.DictReader(io.StringIO(resp.text))}
+
+        assert rows[root_id]["parent_id"] == ""
+        assert rows[root_id]["role"] == "user"
+        assert rows[root_id]["path_depth"] == "0"
+        assert rows[root_id]["is_bookmarked"] == "false"
+        assert rows[child_id]["parent_id"] == root_id
+        assert rows[child_id]["path_depth"] == "1"
+
     async def test_csv_annotation_tags_comma_separated(self, export_client):
         """CSV has annotation_tags as comma-separated values."""
         data = await create_rhizome_with_messages(export_client, n_messages=4)
@@ -302,6 +302,15 @@ def _claude_message(
     return msg
 
 
+# Content blocks shared by the multi-block parser tests (read-only)
+_MULTI_BLOCK_BLOCKS = [
+    {"type": "text", "text": "Let me search for that.", "start_timestamp": "t", "stop_timestamp": "t"},
+    {"type": "web_search", "search_results": [], "is_error": False},
+    {"type": "text", "text": "Here's what I found.", "start_timestamp": "t", "stop_timestamp": "t"},
+]
+_TOOL_USE_BLOCKS = [{"type": "tool_use", "id": "t1", "name": "web_search", "input": {}}]
+
+
 def make_claude_conversation(
     *,
     uuid: str = "conv-claude-1",
@@ -345,17 +354,17 @@ async def db():
 
 
 @pytest.fixture
-async def event_store(db):
+def event_store(db):
     return EventStore(db)
 
 
 @pytest.fixture
-async def projector(db):
+def projector(db):
     return StateProjector(db)
 
 
 @pytest.fixture
-async def import_service(db, event_store, projector):
+def import_service(db, event_store, projector):
     from qivis.importer.service import ImportService
     return ImportService(db, event_store, projector)
 
@@ -621,15 +630,10 @@ class TestClaudeParser:
         """Multi-block content joins text blocks, skips non-text."""
         from qivis.importer.parsers.claude import parse_claude
 
-        blocks = [
-            {"type": "text", "text": "Let me search for that.", "start_timestamp": "t", "stop_timestamp": "t"},
-            {"type": "web_search", "search_results": [], "is_error": False},
-            {"type": "text", "text": "Here's what I found.", "start_timestamp": "t", "stop_timestamp": "t"},
-        ]
         messages = [
             _claude_message("m1", "human", "Search for X", index=0),
             _claude_message("m2", "assistant", "", parent_uuid="m1", index=1,
-                           content_blocks=blocks),
+                           content_blocks=_MULTI_BLOCK_BLOCKS),
         ]
         conv = make_claude_conversation(messages=messages)
         tree = parse_claude(conv)[0]
@@ -641,11 +645,10 @@ class TestClaudeParser:
         from qivis.importer.parsers.claude import parse_claude
 
         # Assistant message with only tool_use, no text
-        blocks = [{"type": "tool_use", "id": "t1", "name": "web_search", "input": {}}]
         messages = [
             _claude_message("m1", "human", "Search", index=0),
             _claude_message("m2", "assistant", "", parent_uuid="m1", index=1,
-                           content_blocks=blocks),
+                           content_blocks=_TOOL_USE_BLOCKS),
             _claude_message("m3", "assistant", "Found it!", parent_uuid="m1", index=2),
         ]
         conv = make_claude_conversation(messages=messages)
@@ -952,10 +955,10 @@ class TestImportAPI:
 
     async def test_preview_endpoint_returns_summary(self, client):
         """Upload file, get preview with correct counts."""
-        data = json.dumps(make_chatgpt_conversation())
+        data = json.dumps(make_chatgpt_conversation()).encode()
         resp = await client.post(
             "/api/import/preview",
-            files={"file": ("test.json", data.encode(), "application/json")},
+            files={"file": ("test.json", data, "application/json")},
         )
         assert resp.status_code == 200
         body = resp.json()
@@ -966,10 +969,10 @@ class TestImportAPI:
 
     async def test_import_endpoint_returns_results(self, client):
         """Upload file, get tree IDs back."""
-        data = json.dumps(make_chatgpt_conversation())
+        data = json.dumps(make_chatgpt_conversation()).encode()
         resp = await client.post(
             "/api/import",
-            files={"file": ("test.json", data.encode(), "application/json")},
+            files={"file": ("test.json", data, "application/json")},
         )
         assert resp.status_code == 200
         body = resp.json()
@@ -987,10 +990,10 @@ class TestImportAPI:
 
     async def test_unrecognized_format_returns_422(self, client):
         """Valid JSON but unrecognized structure returns error."""
-        data = json.dumps({"random": "data"})
+        data = json.dumps({"random": "data"}).encode()
         resp = await client.post(
             "/api/import/preview",
-            files={"file": ("test.json", data.encode(), "application/json")},
+            files={"file": ("test.json", data, "application/json")},
         )
         assert resp.status_code == 422
 
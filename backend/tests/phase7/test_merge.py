@@ -3,17 +3,17 @@
 import json
 
 import pytest
-from httpx import ASGITransport, AsyncClient
 
-from qivis.db.connection import Database
 from qivis.events.projector import StateProjector
 from qivis.events.store import EventStore
 from qivis.importer.merge import MergePlan, _compute_merge_plan
 from qivis.importer.models import ImportedNode, ImportedTree
-from qivis.main import app
-from qivis.rhizomes.router import get_rhizome_service
+from qivis.rhizomes.schemas import CreateRhizomeRequest
 from qivis.rhizomes.service import RhizomeService
 
+# Tests share one module database; its tables are wiped after each test.
+pytestmark = pytest.mark.shared_db
+
 
 # ---------------------------------------------------------------------------
 # Helpers for building fixture data
@@ -73,194 +73,163 @@ def _existing_node(
 # ---------------------------------------------------------------------------
 
 
-class TestComputeMergePlan:
-    """Test the pure matching algorithm without I/O."""
-
-    def test_linear_extend(self):
-        """Existing A->B->C->D, import A'->B'->C'->D'->E->F.
-        Should match 4 and create 2 new (E, F)."""
-        existing = [
-            _existing_node("n1", None, "user", "Hello"),
-            _existing_node("n2", "n1", "assistant", "Hi there"),
-            _existing_node("n3", "n2", "user", "How are you?"),
-            _existing_node("n4", "n3", "assistant", "I'm doing well"),
-        ]
-        imported = _imported_tree([
-            _imported_node("a", None, "user", "Hello"),
-            _imported_node("b", "a", "assistant", "Hi there"),
-            _imported_node("c", "b", "user", "How are you?"),
-            _imported_node("d", "c", "assistant", "I'm doing well"),
-            _imported_node("e", "d", "user", "What's new?"),
-            _imported_node("f", "e", "assistant", "Not much!"),
-        ])
-
-        plan = _compute_merge_plan(imported, existing)
-
-        assert len(plan.matched) == 4
-        assert plan.matched["a"] == "n1"
-        assert plan.matched["b"] == "n2"
-        assert plan.matched["c"] == "n3"
-        assert plan.matched["d"] == "n4"
-        assert len(plan.new_nodes) == 2
-        assert [n.temp_id for n in plan.new_nodes] == ["e", "f"]
-        # E should be grafted onto n4 (the matched parent of D)
-        assert plan.graft_map["e"] == "n4"
-        # F's parent (E) is new, so F's graft_map entry should be None
-        # (its parent_temp_id is "e" which is not in matched)
-        # Actually F's parent is E which is new, so graft_map["f"] should
-        # point to E's graft parent, which we set to None when parent is new.
-        # Let me re-check the algorithm: when parent is new, we set
-        # graft_map[temp_id] = graft_map of parent. But parent's graft_map
-        # is "n4". Hmm no — the algorithm says:
-        #   parent_real_id = plan.graft_map.get(node.parent_temp_id)
-        # For F: parent_temp_id="e", "e" not in matched, so we look at
-        # graft_map["e"] = "n4" -> graft_map["f"] = "n4"
-        # But that's wrong for graft_map semantics. Let me check.
-        # Actually graft_map is just for tracking, execute_merge resolves
-        # the real parent via temp_to_real for new-to-new relationships.
-        # The graft_map value for F doesn't matter much since F's parent
-        # is another new node (E). What matters is the graft_map["e"] = "n4".
-
-    def test_diverge_creates_branch(self):
-        """Existing A->B->C->D, import A'->B'->X->Y.
-        Should match 2 (A, B), create 2 new (X, Y) branching from B."""
-        existing = [
-            _existing_node("n1", None, "user", "Hello"),
-            _existing_node("n2", "n1", "assistant", "Hi there"),
-            _existing_node("n3", "n2", "user", "How are you?"),
-            _existing_node("n4", "n3", "assistant", "I'm doing well"),
-        ]
-        imported = _imported_tree([
-            _imported_node("a", None, "user", "Hello"),
-            _imported_node("b", "a", "assistant", "Hi there"),
-            _imported_node("x", "b", "user", "Something different"),
-            _imported_node("y", "x", "assistant", "Different response"),
-        ])
-
-        plan = _compute_merge_plan(imported, existing)
-
-        assert len(plan.matched) == 2
-        assert plan.matched["a"] == "n1"
-        assert plan.matched["b"] == "n2"
-        assert len(plan.new_nodes) == 2
-        assert [n.temp_id for n in plan.new_nodes] == ["x", "y"]
-        # X grafts onto n2 (B's matched ID)
-        assert plan.graft_map["x"] == "n2"
-
-    def test_no_overlap_creates_new_root(self):
-        """Completely different content. All nodes new as new root(s)."""
-        existing = [
-            _existing_node("n1", None, "user", "Hello"),
-            _existing_node("n2", "n1", "assistant", "Hi there"),
-        ]
-        imported = _imported_tree([
-            _imported_node("a", None, "user", "Completely different"),
-            _imported_node("b", "a", "assistant", "Also different"),
-        ])
-
-        plan = _compute_merge_plan(imported, existing)
-
-        assert len(plan.matched) == 0
-        assert len(plan.new_nodes) == 2
-        # A is a new root: graft_map["a"] = None
-        assert plan.graft_map["a"] is None
-
-    def test_full_overlap_nothing_to_merge(self):
-        """All imported nodes match existing ones. Nothing new."""
-        existing = [
-            _existing_node("n1", None, "user", "Hello"),
-            _existing_node("n2", "n1", "assistant", "Hi there"),
-            _existing_node("n3", "n2", "user", "Goodbye"),
-        ]
-        imported = _imported_tree([
-            _imported_node("a", None, "user", "Hello"),
-            _imported_node("b", "a", "assistant", "Hi there"),
-            _imported_node("c", "b", "user", "Goodbye"),
-        ])
-
-        plan = _compute_merge_plan(imported, existing)
-
-        assert len(plan.matched) == 3
-        assert len(plan.new_nodes) == 0
-
-    def test_branching_import_partial_overlap(self):
-        """Import has a fork: A->B->C and A->B->X.
-        Existing has A->B->C. Should match A, B, C and create X."""
-        existing = [
-            _existing_node("n1", None, "user", "Hello"),
-            _existing_node("n2", "n1", "assistant", "Hi"),
-            _existing_node("n3", "n2", "user", "Path C"),
-        ]
-        imported = _imported_tree([
-            _imported_node("a", None, "user", "Hello"),
-            _imported_node("b", "a", "assistant", "Hi"),
-            _imported_node("c", "b", "user", "Path C"),
-            _imported_node("x", "b", "user", "Path X"),
-        ])
+_CONVERSATION = (
+    ("n1", None, "user", "Hello"),
+    ("n2", "n1", "assistant", "Hi there"),
+    ("n3", "n2", "user", "How are you?"),
+    ("n4", "n3", "assistant", "I'm doing well"),
+)
+
+_EDITED_CONVERSATION = (
+    ("n1", None, "user", "Original text", "Edited text"),
+    ("n2", "n1", "assistant", "Response"),
+)
+
+# (id, existing rows, imported rows, expected matched, expected new temp_ids,
+#  expected graft_map entries). Existing rows are (node_id, parent_id, role,
+#  content[, edited_content]); imported rows are (temp_id, parent, role, content).
+MERGE_PLAN_CASES = [
+    (
+        # Existing A->B->C->D, import A'->B'->C'->D'->E->F. F's parent is new,
+        # so execute_merge resolves it via temp_to_real; only E's graft matters.
+        "linear_extend",
+        _CONVERSATION,
+        (
+            ("a", None, "user", "Hello"),
+            ("b", "a", "assistant", "Hi there"),
+            ("c", "b", "user", "How are you?"),
+            ("d", "c", "assistant", "I'm doing well"),
+            ("e", "d", "user", "What's new?"),
+            ("f", "e", "assistant", "Not much!"),
+        ),
+        {"a": "n1", "b": "n2", "c": "n3", "d": "n4"},
+        ["e", "f"],
+        {"e": "n4"},
+    ),
+    (
+        # Existing A->B->C->D, import A'->B'->X->Y: X and Y branch from B.
+        "diverge_creates_branch",
+        _CONVERSATION,
+        (
+            ("a", None, "user", "Hello"),
+            ("b", "a", "assistant", "Hi there"),
+            ("x", "b", "user", "Something different"),
+            ("y", "x", "assistant", "Different response"),
+        ),
+        {"a": "n1", "b": "n2"},
+        ["x", "y"],
+        {"x": "n2"},
+    ),
+    (
+        # Completely different content: all nodes new, A becomes a new root.
+        "no_overlap_creates_new_root",
+        _CONVERSATION[:2],
+        (
+            ("a", None, "user", "Completely different"),
+            ("b", "a", "assistant", "Also different"),
+        ),
+        {},
+        ["a", "b"],
+        {"a": None},
+    ),
+    (
+        "full_overlap_nothing_to_merge",
+        _CONVERSATION[:3],
+        (
+            ("a", None, "user", "Hello"),
+            ("b", "a", "assistant", "Hi there"),
+            ("c", "b", "user", "How are you?"),
+        ),
+        {"a": "n1", "b": "n2", "c": "n3"},
+        [],
+        {},
+    ),
+    (
+        # Import forks A->B->C and A->B->X; existing has A->B->C.
+        "branching_import_partial_overlap",
+        _CONVERSATION[:3],
+        (
+            ("a", None, "user", "Hello"),
+            ("b", "a", "assistant", "Hi there"),
+            ("c", "b", "user", "How are you?"),
+            ("x", "b", "user", "Path X"),
+        ),
+        {"a": "n1", "b": "n2", "c": "n3"},
+        ["x"],
+        {"x": "n2"},
+    ),
+    (
+        "whitespace_normalization",
+        _CONVERSATION[:2],
+        (
+            ("a", None, "user", "  Hello  "),
+            ("b", "a", "assistant", "Hi there\n"),
+        ),
+        {"a": "n1", "b": "n2"},
+        [],
+        {},
+    ),
+    (
+        # When edited_content is set, match against that instead of content.
+        "match_against_edited_content",
+        _EDITED_CONVERSATION,
+        (
+            ("a", None, "user", "Edited text"),
+            ("b", "a", "assistant", "Response"),
+        ),
+        {"a": "n1", "b": "n2"},
+        [],
+        {},
+    ),
+    (
+        "original_content_of_edited_node_does_not_match",
+        _EDITED_CONVERSATION,
+        (
+            ("a", None, "user", "Original text"),
+            ("b", "a", "assistant", "Response"),
+        ),
+        {},
+        ["a", "b"],
+        {},
+    ),
+    (
+        "role_mismatch_does_not_match",
+        _CONVERSATION[:1],
+        (("a", None, "assistant", "Hello"),),
+        {},
+        ["a"],
+        {},
+    ),
+]
+
+
+def _build_case(
+    existing_rows: tuple[tuple, ...],
+    imported_rows: tuple[tuple, ...],
+) -> tuple[ImportedTree, list[dict]]:
+    """Build the (imported tree, existing nodes) pair for one case."""
+    existing = [
+        _existing_node(*row[:4], edited_content=row[4] if len(row) > 4 else None)
+        for row in existing_rows
+    ]
+    imported = _imported_tree([_imported_node(*row) for row in imported_rows])
+    return imported, existing
 
-        plan = _compute_merge_plan(imported, existing)
 
-        assert len(plan.matched) == 3
-        assert plan.matched["c"] == "n3"
-        assert len(plan.new_nodes) == 1
-        assert plan.new_nodes[0].temp_id == "x"
-        # X grafts onto n2 (B's matched parent)
-        assert plan.graft_map["x"] == "n2"
-
-    def test_whitespace_normalization(self):
-        """Content with leading/trailing whitespace should still match."""
-        existing = [
-            _existing_node("n1", None, "user", "Hello"),
-            _existing_node("n2", "n1", "assistant", "Hi there"),
-        ]
-        imported = _imported_tree([
-            _imported_node("a", None, "user", "  Hello  "),
-            _imported_node("b", "a", "assistant", "Hi there\n"),
-        ])
-
-        plan = _compute_merge_plan(imported, existing)
-
-        assert len(plan.matched) == 2
-        assert len(plan.new_nodes) == 0
-
-    def test_match_against_edited_content(self):
-        """When edited_content is set, match against that instead of content."""
-        existing = [
-            _existing_node(
-                "n1", None, "user", "Original text",
-                edited_content="Edited text",
-            ),
-            _existing_node("n2", "n1", "assistant", "Response"),
-        ]
-        # Import with the edited version should match
-        imported_match = _imported_tree([
-            _imported_node("a", None, "user", "Edited text"),
-            _imported_node("b", "a", "assistant", "Response"),
-        ])
-        plan = _compute_merge_plan(imported_match, existing)
-        assert len(plan.matched) == 2
+class TestComputeMergePlan:
+    """Test the pure matching algorithm without I/O."""
 
-        # Import with the original version should NOT match
-        imported_no_match = _imported_tree([
-            _imported_node("a", None, "user", "Original text"),
-            _imported_node("b", "a", "assistant", "Response"),
-        ])
-        plan2 = _compute_merge_plan(imported_no_match, existing)
-        assert len(plan2.matched) == 0
-
-    def test_role_mismatch_does_not_match(self):
-        """Same content but different role should not match."""
-        existing = [
-            _existing_node("n1", None, "user", "Hello"),
-        ]
-        imported = _imported_tree([
-            _imported_node("a", None, "assistant", "Hello"),
-        ])
+    @pytest.mark.parametrize("case", MERGE_PLAN_CASES, ids=lambda c: c[0])
+    def test_merge_plan(self, case):
+        _, existing_rows, imported_rows, matched, new_ids, graft = case
+        imported, existing = _build_case(existing_rows, imported_rows)
 
         plan = _compute_merge_plan(imported, existing)
 
-        assert len(plan.matched) == 0
-        assert len(plan.new_nodes) == 1
+        assert plan.matched == matched
+        assert [n.temp_id for n in plan.new_nodes] == new_ids
+        for temp_id, parent_id in graft.items():
+            assert plan.graft_map[temp_id] == parent_id
 
 
 # ---------------------------------------------------------------------------
@@ -273,77 +242,69 @@ def _make_linear_json(messages: list[dict]) -> bytes:
     return json.dumps(messages).encode()
 
 
-@pytest.fixture
-async def setup():
-    """Create a fresh database and test client."""
-    db = await Database.connect(":memory:")
-    store = EventStore(db)
-    projector = StateProjector(db)
-    service = RhizomeService(db)
-    app.dependency_overrides[get_rhizome_service] = lambda: service
-
+# Pre-encoded import files shared by the API tests
+HELLO_HI_EXTENDED = _make_linear_json([
+    {"role": "user", "content": "Hello"},
+    {"role": "assistant", "content": "Hi there"},
+    {"role": "user", "content": "New message"},
+    {"role": "assistant", "content": "New response"},
+])
+HELLO_HI_NEW_QUESTION = _make_linear_json([
+    {"role": "user", "content": "Hello"},
+    {"role": "assistant", "content": "Hi there"},
+    {"role": "user", "content": "New question"},
+])
+HELLO_HI = _make_linear_json([
+    {"role": "user", "content": "Hello"},
+    {"role": "assistant", "content": "Hi there"},
+])
+
+
+@pytest.fixture(scope="module")
+def app_overrides(_module_db):
+    """Serve merge and import services over the module database from the shared client."""
     from qivis.importer.merge import MergeService
     from qivis.importer.merge_router import get_merge_service
-
-    merge_svc = MergeService(db, store, projector)
-    app.dependency_overrides[get_merge_service] = lambda: merge_svc
-
-    from qivis.importer.service import ImportService
     from qivis.importer.router import get_import_service
+    from qivis.importer.service import ImportService
 
-    import_svc = ImportService(db, store, projector)
-    app.dependency_overrides[get_import_service] = lambda: import_svc
+    store = EventStore(_module_db)
+    projector = StateProjector(_module_db)
+    merge_svc = MergeService(_module_db, store, projector)
+    import_svc = ImportService(_module_db, store, projector)
+    return {
+        get_merge_service: lambda: merge_svc,
+        get_import_service: lambda: import_svc,
+    }
 
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as client:
-        yield client, service, store, db
 
-    app.dependency_overrides.clear()
-    await db.close()
+@pytest.fixture
+def service(db):
+    """RhizomeService over the module database, for seeding existing trees."""
+    return RhizomeService(db)
 
 
 async def _create_rhizome_with_messages(
-    client: AsyncClient,
+    service: RhizomeService,
     messages: list[tuple[str, str]],
 ) -> tuple[str, list[str]]:
-    """Helper: create a tree and add messages manually. Returns (rhizome_id, node_ids)."""
-    resp = await client.post("/api/rhizomes", json={"title": "Test Rhizome"})
-    assert resp.status_code == 201
-    rhizome_id = resp.json()["rhizome_id"]
-
-    node_ids = []
-    parent_id = None
-    for role, content in messages:
-        resp = await client.post(
-            f"/api/rhizomes/{rhizome_id}/nodes",
-            json={"parent_id": parent_id, "role": role, "content": content},
-        )
-        assert resp.status_code == 201
-        node_id = resp.json()["node_id"]
-        node_ids.append(node_id)
-        parent_id = node_id
-
-    return rhizome_id, node_ids
+    """Helper: create a rhizome and add messages via the service. Returns (rhizome_id, node_ids)."""
+    rhizome = await service.create_rhizome(CreateRhizomeRequest(title="Test Rhizome"))
+    node_ids = await service.create_node_chain(rhizome.rhizome_id, messages)
+    return rhizome.rhizome_id, node_ids
 
 
 class TestMergeAPI:
     """Integration tests through the HTTP API."""
 
-    @pytest.mark.asyncio
-    async def test_preview_returns_correct_counts(self, setup):
-        client, *_ = setup
-        rhizome_id, node_ids = await _create_rhizome_with_messages(client, [
+    async def test_preview_returns_correct_counts(self, client, service):
+        rhizome_id, node_ids = await _create_rhizome_with_messages(service, [
             ("user", "Hello"),
             ("assistant", "Hi there"),
         ])
 
         # Import file extends the conversation
-        file_data = _make_linear_json([
-            {"role": "user", "content": "Hello"},
-            {"role": "assistant", "content": "Hi there"},
-            {"role": "user", "content": "New message"},
-            {"role": "assistant", "content": "New response"},
-        ])
+        file_data = HELLO_HI_EXTENDED
 
         resp = await client.post(
             f"/api/rhizomes/{rhizome_id}/merge/preview",
@@ -357,19 +318,13 @@ class TestMergeAPI:
         assert data["source_format"] == "linear"
         assert len(data["graft_points"]) == 1
 
-    @pytest.mark.asyncio
-    async def test_merge_creates_nodes_with_correct_parent(self, setup):
-        client, *_ = setup
-        rhizome_id, node_ids = await _create_rhizome_with_messages(client, [
+    async def test_merge_creates_nodes_with_correct_parent(self, client, service, projector):
+        rhizome_id, node_ids = await _create_rhizome_with_messages(service, [
             ("user", "Hello"),
             ("assistant", "Hi there"),
         ])
 
-        file_data = _make_linear_json([
-            {"role": "user", "content": "Hello"},
-            {"role": "assistant", "content": "Hi there"},
-            {"role": "user", "content": "New question"},
-        ])
+        file_data = HELLO_HI_NEW_QUESTION
 
         resp = await client.post(
             f"/api/rhizomes/{rhizome_id}/merge",
@@ -382,19 +337,14 @@ class TestMergeAPI:
         assert len(data["node_ids"]) == 1
 
         # Verify the new node is in the tree with correct parent
-        tree_resp = await client.get(f"/api/rhizomes/{rhizome_id}")
-        tree_data = tree_resp.json()
-        new_node = next(
-            n for n in tree_data["nodes"] if n["node_id"] == data["node_ids"][0]
-        )
+        new_node = await projector.get_node(rhizome_id, data["node_ids"][0])
+        assert new_node is not None
         assert new_node["parent_id"] == node_ids[-1]  # parented to last existing node
         assert new_node["role"] == "user"
         assert new_node["content"] == "New question"
 
-    @pytest.mark.asyncio
-    async def test_merge_preserves_metadata(self, setup):
-        client, *_ = setup
-        rhizome_id, _ = await _create_rhizome_with_messages(client, [
+    async def test_merge_preserves_metadata(self, client, service, projector):
+        rhizome_id, _ = await _create_rhizome_with_messages(service, [
             ("user", "Hello"),
         ])
 
@@ -412,17 +362,12 @@ class TestMergeAPI:
         data = resp.json()
         assert data["created_count"] == 1
 
-        tree_resp = await client.get(f"/api/rhizomes/{rhizome_id}")
-        new_node = next(
-            n for n in tree_resp.json()["nodes"]
-            if n["node_id"] == data["node_ids"][0]
-        )
+        new_node = await projector.get_node(rhizome_id, data["node_ids"][0])
+        assert new_node is not None
         assert new_node["model"] == "gpt-4"
 
-    @pytest.mark.asyncio
-    async def test_merge_events_have_device_id_merge(self, setup):
-        client, _, store, db = setup
-        rhizome_id, _ = await _create_rhizome_with_messages(client, [
+    async def test_merge_events_have_device_id_merge(self, client, service, event_store):
+        rhizome_id, _ = await _create_rhizome_with_messages(service, [
             ("user", "Hello"),
         ])
 
@@ -438,14 +383,12 @@ class TestMergeAPI:
         assert resp.status_code == 200
 
         # Check event log
-        events = await store.get_events(rhizome_id)
+        events = await event_store.get_events(rhizome_id)
         merge_events = [e for e in events if e.device_id == "merge"]
         assert len(merge_events) == 1
         assert merge_events[0].event_type == "NodeCreated"
 
-    @pytest.mark.asyncio
-    async def test_merge_tree_not_found_404(self, setup):
-        client, *_ = setup
+    async def test_merge_tree_not_found_404(self, client):
 
         file_data = _make_linear_json([
             {"role": "user", "content": "Hello"},
@@ -457,18 +400,13 @@ class TestMergeAPI:
         )
         assert resp.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_full_overlap_returns_zero_created(self, setup):
-        client, *_ = setup
-        rhizome_id, _ = await _create_rhizome_with_messages(client, [
+    async def test_full_overlap_returns_zero_created(self, client, service):
+        rhizome_id, _ = await _create_rhizome_with_messages(service, [
             ("user", "Hello"),
             ("assistant", "Hi there"),
         ])
 
-        file_data = _make_linear_json([
-            {"role": "user", "content": "Hello"},
-            {"role": "assistant", "content": "Hi there"},
-        ])
+        file_data = HELLO_HI
 
         resp = await client.post(
             f"/api/rhizomes/{rhizome_id}/merge",
@@ -480,18 +418,15 @@ class TestMergeAPI:
         assert data["matched_count"] == 2
         assert data["node_ids"] == []
 
-    @pytest.mark.asyncio
-    async def test_existing_tree_unchanged_after_merge(self, setup):
-        client, *_ = setup
-        rhizome_id, original_ids = await _create_rhizome_with_messages(client, [
+    async def test_existing_tree_unchanged_after_merge(self, client, service, projector):
+        rhizome_id, original_ids = await _create_rhizome_with_messages(service, [
             ("user", "Hello"),
             ("assistant", "Hi there"),
         ])
 
         # Get original tree state
-        orig_resp = await client.get(f"/api/rhizomes/{rhizome_id}")
         orig_nodes = {
-            n["node_id"]: n for n in orig_resp.json()["nodes"]
+            n["node_id"]: n for n in await projector.get_nodes(rhizome_id)
         }
 
         # Merge extending conversation
@@ -507,10 +442,11 @@ class TestMergeAPI:
         )
 
         # Verify original nodes unchanged
-        new_resp = await client.get(f"/api/rhizomes/{rhizome_id}")
-        for node in new_resp.json()["nodes"]:
-            if node["node_id"] in orig_nodes:
-                orig = orig_nodes[node["node_id"]]
-                assert node["content"] == orig["content"]
-                assert node["parent_id"] == orig["parent_id"]
-                assert node["role"] == orig["role"]
+        new_nodes = {
+            n["node_id"]: n for n in await projector.get_nodes(rhizome_id)
+        }
+        for node_id, orig in orig_nodes.items():
+            node = new_nodes[node_id]
+            assert node["content"] == orig["content"]
+            assert node["parent_id"] == orig["parent_id"]
+            assert node["role"] == orig["role"]
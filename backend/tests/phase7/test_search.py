@@ -3,113 +3,108 @@
 from datetime import UTC, datetime, timedelta
 
 import pytest
-from httpx import ASGITransport, AsyncClient
+import pytest_asyncio
 
-from qivis.db.connection import Database
 from qivis.events.projector import StateProjector
 from qivis.events.store import EventStore
-from qivis.main import app
-from qivis.search.router import get_search_service
 from qivis.search.service import SearchService
-from qivis.rhizomes.router import get_rhizome_service
-from qivis.rhizomes.service import RhizomeService
 
 from tests.fixtures import (
-    make_annotation_added_envelope,
+    append_and_project,
+    connect_test_db,
+    fts_deferred,
     make_node_created_envelope,
     make_rhizome_created_envelope,
+    seed_annotation,
+    seed_rhizome,
 )
 
+# Tests share one module database; its tables are wiped after each test.
+pytestmark = pytest.mark.shared_db
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-async def _seed_tree(
-    event_store: EventStore,
-    projector: StateProjector,
-    *,
-    rhizome_id: str | None = None,
-    title: str = "Test Rhizome",
-    nodes: list[dict] | None = None,
-) -> dict:
-    """Create a tree with nodes. Returns {rhizome_id, node_ids}."""
-    tree_ev = make_rhizome_created_envelope(rhizome_id=rhizome_id, title=title)
-    await event_store.append(tree_ev)
-    await projector.project([tree_ev])
-
-    node_ids = []
-    parent_id = None
-    for node_spec in (nodes or []):
-        node_ev = make_node_created_envelope(
-            rhizome_id=tree_ev.rhizome_id,
-            parent_id=parent_id,
-            **node_spec,
-        )
-        await event_store.append(node_ev)
-        await projector.project([node_ev])
-        node_ids.append(node_ev.payload["node_id"])
-        parent_id = node_ev.payload["node_id"]
-
-    return {"rhizome_id": tree_ev.rhizome_id, "node_ids": node_ids}
-
-
-async def _seed_annotation(
-    event_store: EventStore,
-    projector: StateProjector,
-    rhizome_id: str,
-    node_id: str,
-    tag: str,
-    value: str | None = None,
-) -> None:
-    """Add an annotation to a node."""
-    ann_ev = make_annotation_added_envelope(
-        rhizome_id=rhizome_id, node_id=node_id, tag=tag, value=value,
-    )
-    await event_store.append(ann_ev)
-    await projector.project([ann_ev])
+def _assert_search_response_shape(body: dict, query: str) -> None:
+    """Check the SearchResponse wire shape: query echo, totals, and item keys."""
+    assert "query" in body
+    assert "results" in body
+    assert "total" in body
+    assert body["query"] == query
+    assert len(body["results"]) >= 1
+    item = body["results"][0]
+    assert "node_id" in item
+    assert "rhizome_id" in item
+    assert "snippet" in item
 
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
-@pytest.fixture
-async def db():
-    database = await Database.connect(":memory:")
-    yield database
+@pytest.fixture(scope="module")
+def search_service(_module_db):
+    """SearchService holds no per-query state, so one instance serves the module."""
+    return SearchService(_module_db)
+
+
+@pytest.fixture(scope="module")
+def app_overrides(search_service):
+    """Serve the module's SearchService from the shared client."""
+    from qivis.search.router import get_search_service
+
+    return {get_search_service: lambda: search_service}
+
+
+# Read-only corpus shared by TestSearchCorpus; each test queries a keyword
+# that appears in exactly one of these trees.
+_SEARCH_CORPUS = [
+    [
+        {"role": "user", "content": "photosynthesis?"},
+        {"role": "assistant", "content": "Photosynthesis converts sunlight"},
+    ],
+    [
+        {"role": "user", "content": "quantum entanglement"},
+    ],
+    [
+        {
+            "role": "assistant",
+            "content": "Hi",
+            "system_prompt": "cephalopods",
+            "model": "test-model",
+            "provider": "test-provider",
+        },
+    ],
+    [
+        {"role": "user", "content": f"limitword {i}"}
+        for i in range(10)
+    ],
+    [
+        {"role": "user", "content": "The weather is nice today"},
+        {
+            "role": "user",
+            "content": "Relevance relevance relevance — this node is very relevant to relevance",
+        },
+        {"role": "user", "content": "Tangentially mentioning relevance once"},
+    ],
+]
+
+
+@pytest_asyncio.fixture(scope="class")
+async def seeded_search():
+    """A SearchService over its own database holding _SEARCH_CORPUS, seeded once per class."""
+    database = await connect_test_db()
+    event_store = EventStore(database)
+    projector = StateProjector(database)
+    async with fts_deferred(database):
+        for nodes in _SEARCH_CORPUS:
+            await seed_rhizome(event_store, projector, nodes=nodes)
+    yield SearchService(database)
     await database.close()
 
 
-@pytest.fixture
-async def event_store(db):
-    return EventStore(db)
-
-
-@pytest.fixture
-async def projector(db):
-    return StateProjector(db)
-
-
-@pytest.fixture
-async def search_service(db):
-    return SearchService(db)
-
-
-@pytest.fixture
-async def client(db):
-    tree_service = RhizomeService(db)
-    search_service = SearchService(db)
-    app.dependency_overrides[get_rhizome_service] = lambda: tree_service
-    app.dependency_overrides[get_search_service] = lambda: search_service
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test",
-    ) as c:
-        yield c
-    app.dependency_overrides.clear()
-
-
 # ---------------------------------------------------------------------------
 # Contract tests — FTS5 infrastructure
 # ---------------------------------------------------------------------------
@@ -126,48 +121,44 @@ class TestFTS5Infrastructure:
 
     async def test_fts_insert_trigger_fires(self, db, event_store, projector):
         """When a node is created via the projector, it appears in FTS search."""
-        data = await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "The quick brown fox jumps over the lazy dog"},
+        data = await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "quick brown fox"},
         ])
-        rows = await db.fetchall(
-            "SELECT * FROM nodes_fts WHERE nodes_fts MATCH ?", ('"quick brown fox"',)
+        row = await db.fetchone(
+            "SELECT count(*) FROM nodes_fts WHERE nodes_fts MATCH ?", ('"quick brown fox"',)
         )
-        assert len(rows) == 1
+        assert row[0] == 1
 
     async def test_fts_delete_trigger_fires(self, db, event_store, projector):
         """When a node is deleted from the nodes table, it disappears from FTS."""
-        data = await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "ephemeral message"},
+        data = await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "ephemeral"},
         ])
         node_id = data["node_ids"][0]
         # Direct delete (not a normal operation, but tests the trigger)
         await db.execute("DELETE FROM nodes WHERE node_id = ?", (node_id,))
-        rows = await db.fetchall(
-            "SELECT * FROM nodes_fts WHERE nodes_fts MATCH ?", ('"ephemeral"',)
+        row = await db.fetchone(
+            "SELECT count(*) FROM nodes_fts WHERE nodes_fts MATCH ?", ('"ephemeral"',)
         )
-        assert len(rows) == 0
+        assert row[0] == 0
 
     async def test_fts_backfill_indexes_existing_nodes(self, db):
         """The FTS rebuild command re-indexes all nodes from the content table."""
         now = datetime.now(UTC).isoformat()
-        # Create a rhizome first (foreign key constraint)
-        await db.execute(
-            "INSERT INTO rhizomes (rhizome_id, title, created_at, updated_at) "
-            "VALUES (?, ?, ?, ?)",
-            ("tree-1", "Test", now, now),
-        )
-        # Insert a node (trigger will auto-index it)
-        await db.execute(
-            "INSERT INTO nodes (node_id, rhizome_id, role, content, created_at) "
-            "VALUES (?, ?, ?, ?, ?)",
-            ("backfill-test", "tree-1", "user", "backfill canary text", now),
-        )
-        # Rebuild should not duplicate — still exactly one match
-        await db.execute("INSERT INTO nodes_fts(nodes_fts) VALUES('rebuild')")
-        rows = await db.fetchall(
-            "SELECT * FROM nodes_fts WHERE nodes_fts MATCH ?", ('"backfill canary"',)
+        await db.executescript(f"""
+            -- Create a rhizome first (foreign key constraint)
+            INSERT INTO rhizomes (rhizome_id, title, created_at, updated_at)
+            VALUES ('tree-1', 'Test', '{now}', '{now}');
+            -- Insert a node (trigger will auto-index it)
+            INSERT INTO nodes (node_id, rhizome_id, role, content, created_at)
+            VALUES ('backfill-test', 'tree-1', 'user', 'backfill canary text', '{now}');
+            -- Rebuild should not duplicate — still exactly one match
+            INSERT INTO nodes_fts(nodes_fts) VALUES('rebuild');
+        """)
+        row = await db.fetchone(
+            "SELECT count(*) FROM nodes_fts WHERE nodes_fts MATCH ?", ('"backfill canary"',)
         )
-        assert len(rows) == 1
+        assert row[0] == 1
 
 
 # ---------------------------------------------------------------------------
@@ -177,41 +168,15 @@ class TestFTS5Infrastructure:
 class TestSearchService:
     """SearchService query building, filtering, and result mapping."""
 
-    async def test_search_returns_matching_nodes(
-        self, db, event_store, projector, search_service,
-    ):
-        """Basic keyword search returns nodes with matching content."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "Tell me about photosynthesis"},
-            {"role": "assistant", "content": "Photosynthesis is the process by which plants convert sunlight"},
-        ])
-        result = await search_service.search("photosynthesis")
-        assert result.total >= 2
-        node_ids = {r.node_id for r in result.results}
-        assert len(node_ids) >= 2
-
-    async def test_search_returns_snippet_with_highlighting(
-        self, db, event_store, projector, search_service,
-    ):
-        """Results include snippets with [[mark]]/[[/mark]] delimiters."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "Tell me about quantum entanglement"},
-        ])
-        result = await search_service.search("quantum")
-        assert result.total >= 1
-        snippet = result.results[0].snippet
-        assert "[[mark]]" in snippet
-        assert "[[/mark]]" in snippet
-
     async def test_search_sanitizes_fts_operators(
         self, db, event_store, projector, search_service,
     ):
         """FTS5 operators like AND, OR, NOT are treated as literal words."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "This AND that OR something NOT nothing"},
+        await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "this AND that OR NOT"},
         ])
         # Should not crash — operators are quoted as literal words
-        result = await search_service.search("AND OR NOT")
+        result = await search_service.search("AND OR NOT", include_snippet=False)
         # The content contains all three words, so it should match
         assert result.total >= 1
 
@@ -219,39 +184,23 @@ class TestSearchService:
         self, db, event_store, projector, search_service,
     ):
         """Multi-word search requires all terms present (implicit AND)."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "The cat sat on the mat"},
-            {"role": "user", "content": "The dog ran in the park"},
+        await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "cat on mat"},
+            {"role": "user", "content": "dog in park"},
         ])
         result = await search_service.search("cat mat")
         assert result.total == 1
         assert "cat" in result.results[0].content.lower()
 
-    async def test_search_system_prompt_matches(
-        self, db, event_store, projector, search_service,
-    ):
-        """Nodes with matching system_prompt are returned."""
-        await _seed_tree(event_store, projector, nodes=[
-            {
-                "role": "assistant",
-                "content": "Hello there!",
-                "system_prompt": "You are a marine biologist specializing in cephalopods",
-                "model": "test-model",
-                "provider": "test-provider",
-            },
-        ])
-        result = await search_service.search("cephalopods")
-        assert result.total >= 1
-
     async def test_search_filter_rhizome_ids(
         self, db, event_store, projector, search_service,
     ):
         """rhizome_ids filter limits results to specified trees."""
-        data1 = await _seed_tree(event_store, projector, title="Tree A", nodes=[
-            {"role": "user", "content": "universal search term here"},
+        data1 = await seed_rhizome(event_store, projector, title="Tree A", nodes=[
+            {"role": "user", "content": "universal"},
         ])
-        data2 = await _seed_tree(event_store, projector, title="Tree B", nodes=[
-            {"role": "user", "content": "universal search term here"},
+        data2 = await seed_rhizome(event_store, projector, title="Tree B", nodes=[
+            {"role": "user", "content": "universal"},
         ])
         result = await search_service.search(
             "universal", rhizome_ids=[data1["rhizome_id"]],
@@ -263,9 +212,19 @@ class TestSearchService:
         self, db, event_store, projector, search_service,
     ):
         """models filter limits results to specified models."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "assistant", "content": "Response from sonnet", "model": "claude-sonnet", "provider": "anthropic"},
-            {"role": "assistant", "content": "Response from haiku", "model": "claude-haiku", "provider": "anthropic"},
+        await seed_rhizome(event_store, projector, nodes=[
+            {
+                "role": "assistant",
+                "content": "response sonnet",
+                "model": "claude-sonnet",
+                "provider": "anthropic",
+            },
+            {
+                "role": "assistant",
+                "content": "response haiku",
+                "model": "claude-haiku",
+                "provider": "anthropic",
+            },
         ])
         result = await search_service.search("response", models=["claude-sonnet"])
         assert result.total == 1
@@ -275,9 +234,9 @@ class TestSearchService:
         self, db, event_store, projector, search_service,
     ):
         """roles filter limits results to specified roles."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "a unique filterword in conversation"},
-            {"role": "assistant", "content": "a unique filterword in response", "model": "m", "provider": "p"},
+        await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "filterword user"},
+            {"role": "assistant", "content": "filterword assistant", "model": "m", "provider": "p"},
         ])
         result = await search_service.search("filterword", roles=["assistant"])
         assert result.total == 1
@@ -287,11 +246,11 @@ class TestSearchService:
         self, db, event_store, projector, search_service,
     ):
         """tags filter returns only nodes with matching annotations."""
-        data = await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "annotated node content here"},
-            {"role": "user", "content": "unannotated node content here"},
+        data = await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "annotated content"},
+            {"role": "user", "content": "unannotated content"},
         ])
-        await _seed_annotation(
+        await seed_annotation(
             event_store, projector,
             rhizome_id=data["rhizome_id"],
             node_id=data["node_ids"][0],
@@ -307,23 +266,16 @@ class TestSearchService:
         """date_from and date_to filter by node creation date."""
         # Create two nodes with known timestamps
         tree_ev = make_rhizome_created_envelope(title="Date test")
-        await event_store.append(tree_ev)
-        await projector.project([tree_ev])
-
         old_node = make_node_created_envelope(
-            rhizome_id=tree_ev.rhizome_id, role="user", content="old datetest message",
+            rhizome_id=tree_ev.rhizome_id, role="user", content="old datetest",
         )
         old_node.timestamp = datetime(2025, 1, 15, tzinfo=UTC)
-        await event_store.append(old_node)
-        await projector.project([old_node])
-
         new_node = make_node_created_envelope(
-            rhizome_id=tree_ev.rhizome_id, role="user", content="new datetest message",
+            rhizome_id=tree_ev.rhizome_id, role="user", content="new datetest",
             parent_id=old_node.payload["node_id"],
         )
         new_node.timestamp = datetime(2026, 2, 15, tzinfo=UTC)
-        await event_store.append(new_node)
-        await projector.project([new_node])
+        await append_and_project(event_store, projector, [tree_ev, old_node, new_node])
 
         result = await search_service.search(
             "datetest", date_from="2026-01-01",
@@ -335,8 +287,8 @@ class TestSearchService:
         self, db, event_store, projector, search_service,
     ):
         """Archived nodes are excluded from search results."""
-        data = await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "archived test content"},
+        data = await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "archived test"},
         ])
         # Archive the node directly
         await db.execute(
@@ -346,34 +298,60 @@ class TestSearchService:
         result = await search_service.search("archived test")
         assert result.total == 0
 
+    async def test_search_sql_reused_per_filter_shape(self):
+        """Searches with the same filter shape share one SQL string (and prepared statement)."""
+        from qivis.search.service import _build_search_sql
+
+        sql = _build_search_sql(1, 0, 0, 2, 0, True, False)
+        assert _build_search_sql(1, 0, 0, 2, 0, True, False) is sql
+        assert _build_search_sql(2, 0, 0, 2, 0, True, False) != sql
+        assert sql.count("?") == 1 + 1 + 2 + 1 + 1
+
     async def test_search_empty_query_returns_empty(self, search_service):
         """Whitespace-only or empty query returns no results."""
         result = await search_service.search("   ")
         assert result.total == 0
         assert result.results == []
 
-    async def test_search_respects_limit(
-        self, db, event_store, projector, search_service,
-    ):
+
+class TestSearchCorpus:
+    """Read-only searches against the shared seeded corpus."""
+
+    async def test_search_returns_matching_nodes(self, seeded_search):
+        """Basic keyword search returns nodes with matching content."""
+        result = await seeded_search.search("photosynthesis")
+        assert result.total >= 2
+        node_ids = {r.node_id for r in result.results}
+        assert len(node_ids) >= 2
+
+    async def test_search_returns_snippet_with_highlighting(self, seeded_search):
+        """Results include snippets with [[mark]]/[[/mark]] delimiters."""
+        result = await seeded_search.search("quantum")
+        assert result.total >= 1
+        snippet = result.results[0].snippet
+        assert "[[mark]]" in snippet
+        assert "[[/mark]]" in snippet
+
+    async def test_search_response_shape(self, seeded_search):
+        """The service result serializes to the same shape the API returns."""
+        result = await seeded_search.search("quantum")
+        _assert_search_response_shape(result.model_dump(mode="json"), "quantum")
+
+    async def test_search_system_prompt_matches(self, seeded_search):
+        """Nodes with matching system_prompt are returned."""
+        result = await seeded_search.search("cephalopods", include_snippet=False)
+        assert result.total >= 1
+
+    async def test_search_respects_limit(self, seeded_search):
         """limit parameter caps the number of results."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": f"limitword message number {i}"}
-            for i in range(10)
-        ])
-        result = await search_service.search("limitword", limit=3)
+        result = await seeded_search.search("limitword", limit=3, include_snippet=False)
         assert len(result.results) == 3
         assert result.total == 3
+        assert all(r.snippet == "" for r in result.results)
 
-    async def test_search_ordered_by_relevance(
-        self, db, event_store, projector, search_service,
-    ):
+    async def test_search_ordered_by_relevance(self, seeded_search):
         """Results are ordered by BM25 relevance, not insertion order."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "The weather is nice today"},
-            {"role": "user", "content": "Relevance relevance relevance — this node is very relevant to relevance"},
-            {"role": "user", "content": "Tangentially mentioning relevance once"},
-        ])
-        result = await search_service.search("relevance")
+        result = await seeded_search.search("relevance")
         assert result.total >= 2
         # The node with more occurrences of "relevance" should rank higher
         assert "very relevant" in result.results[0].content
@@ -390,21 +368,12 @@ class TestSearchAPI:
         self, db, event_store, projector, client,
     ):
         """GET /api/search?q=keyword returns 200 with correct shape."""
-        await _seed_tree(event_store, projector, nodes=[
-            {"role": "user", "content": "searchable endpoint content"},
+        await seed_rhizome(event_store, projector, nodes=[
+            {"role": "user", "content": "searchable"},
         ])
         resp = await client.get("/api/search", params={"q": "searchable"})
         assert resp.status_code == 200
-        body = resp.json()
-        assert "query" in body
-        assert "results" in body
-        assert "total" in body
-        assert body["query"] == "searchable"
-        assert len(body["results"]) >= 1
-        item = body["results"][0]
-        assert "node_id" in item
-        assert "rhizome_id" in item
-        assert "snippet" in item
+        _assert_search_response_shape(resp.json(), "searchable")
 
     async def test_search_endpoint_requires_query(self, client):
         """GET /api/search without q parameter returns 422."""
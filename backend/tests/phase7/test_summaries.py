@@ -7,23 +7,33 @@ Three sections:
 """
 
 import json
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
 
 from qivis.events.projector import StateProjector
-from qivis.events.store import EventStore
 from qivis.rhizomes.schemas import CreateSummaryRequest
 from qivis.rhizomes.service import RhizomeService
 from tests.fixtures import (
-    create_test_rhizome,
+    add_node,
+    append_and_project,
     create_rhizome_with_messages,
     make_node_created_envelope,
+    make_rhizome_created_envelope,
     make_summary_generated_envelope,
     make_summary_removed_envelope,
-    make_rhizome_created_envelope,
+    seed_linear_branch,
+    seed_rhizome,
 )
 
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+# Tests share one module database; its tables are wiped after each test.
+pytestmark = pytest.mark.shared_db
+
 
 # ---------------------------------------------------------------------------
 # Contract tests: event -> store -> projector -> verify state
@@ -38,9 +48,7 @@ class TestSummaryProjection:
         tree_ev = make_rhizome_created_envelope()
         node_ev = make_node_created_envelope(rhizome_id=tree_ev.rhizome_id, content="Hello")
 
-        for e in [tree_ev, node_ev]:
-            await event_store.append(e)
-        await projector.project([tree_ev, node_ev])
+        await append_and_project(event_store, projector, [tree_ev, node_ev])
 
         node_id = node_ev.payload["node_id"]
         summary_ev = make_summary_generated_envelope(
@@ -51,11 +59,11 @@ class TestSummaryProjection:
             summary="The user greeted the assistant.",
             node_ids=[node_id],
         )
-        await event_store.append(summary_ev)
-        await projector.project([summary_ev])
+        await append_and_project(event_store, projector, [summary_ev])
 
         row = await db.fetchone(
-            "SELECT * FROM summaries WHERE summary_id = ?",
+            "SELECT summary, anchor_node_id, rhizome_id, scope, summary_type, node_ids "
+            "FROM summaries WHERE summary_id = ?",
             (summary_ev.payload["summary_id"],),
         )
         assert row is not None
@@ -71,28 +79,24 @@ class TestSummaryProjection:
         tree_ev = make_rhizome_created_envelope()
         node_ev = make_node_created_envelope(rhizome_id=tree_ev.rhizome_id, content="Hello")
 
-        for e in [tree_ev, node_ev]:
-            await event_store.append(e)
-        await projector.project([tree_ev, node_ev])
+        await append_and_project(event_store, projector, [tree_ev, node_ev])
 
         node_id = node_ev.payload["node_id"]
         summary_ev = make_summary_generated_envelope(
             rhizome_id=tree_ev.rhizome_id,
             anchor_node_id=node_id,
         )
-        await event_store.append(summary_ev)
-        await projector.project([summary_ev])
+        await append_and_project(event_store, projector, [summary_ev])
 
         summary_id = summary_ev.payload["summary_id"]
         remove_ev = make_summary_removed_envelope(
             rhizome_id=tree_ev.rhizome_id,
             summary_id=summary_id,
         )
-        await event_store.append(remove_ev)
-        await projector.project([remove_ev])
+        await append_and_project(event_store, projector, [remove_ev])
 
         row = await db.fetchone(
-            "SELECT * FROM summaries WHERE summary_id = ?",
+            "SELECT 1 FROM summaries WHERE summary_id = ? LIMIT 1",
             (summary_id,),
         )
         assert row is None
@@ -102,9 +106,7 @@ class TestSummaryProjection:
         tree_ev = make_rhizome_created_envelope()
         node_ev = make_node_created_envelope(rhizome_id=tree_ev.rhizome_id, content="Hello")
 
-        for e in [tree_ev, node_ev]:
-            await event_store.append(e)
-        await projector.project([tree_ev, node_ev])
+        await append_and_project(event_store, projector, [tree_ev, node_ev])
 
         node_id = node_ev.payload["node_id"]
 
@@ -120,31 +122,122 @@ class TestSummaryProjection:
             summary_type="detailed",
             summary="Long detailed version with more context.",
         )
-        for e in [summary1, summary2]:
-            await event_store.append(e)
-            await projector.project([e])
+        await append_and_project(event_store, projector, [summary1, summary2])
 
         rows = await db.fetchall(
-            "SELECT * FROM summaries WHERE anchor_node_id = ?",
+            "SELECT summary_type FROM summaries WHERE anchor_node_id = ?",
             (node_id,),
         )
         assert len(rows) == 2
         types = {r["summary_type"] for r in rows}
         assert types == {"concise", "detailed"}
 
+    async def test_mixed_summary_batch_projects_in_order(self, event_store, projector, db):
+        """Batched SummaryGenerated runs stay ordered against interleaved removals."""
+        tree_ev = make_rhizome_created_envelope()
+        node_ev = make_node_created_envelope(rhizome_id=tree_ev.rhizome_id, content="Hello")
+        node_id = node_ev.payload["node_id"]
+
+        removed = make_summary_generated_envelope(
+            rhizome_id=tree_ev.rhizome_id, anchor_node_id=node_id, summary="Removed.",
+        )
+        remove_ev = make_summary_removed_envelope(
+            rhizome_id=tree_ev.rhizome_id, summary_id=removed.payload["summary_id"],
+        )
+        kept = make_summary_generated_envelope(
+            rhizome_id=tree_ev.rhizome_id, anchor_node_id=node_id, summary="Kept.",
+        )
+        await append_and_project(
+            event_store, projector, [tree_ev, node_ev, removed, remove_ev, kept],
+        )
+
+        rows = await db.fetchall(
+            "SELECT summary FROM summaries WHERE anchor_node_id = ?",
+            (node_id,),
+        )
+        assert [r["summary"] for r in rows] == ["Kept."]
+
+    async def test_node_ids_stored_compact_and_read_back(self, event_store, projector, db):
+        """node_ids is stored as compact JSON text that _summary_from_row parses back."""
+        tree_ev = make_rhizome_created_envelope()
+        first_ev = make_node_created_envelope(rhizome_id=tree_ev.rhizome_id, content="Hello")
+        second_ev = make_node_created_envelope(
+            rhizome_id=tree_ev.rhizome_id,
+            parent_id=first_ev.payload["node_id"],
+            role="assistant",
+            content="Hi",
+        )
+        node_ids = [first_ev.payload["node_id"], second_ev.payload["node_id"]]
+        summary_ev = make_summary_generated_envelope(
+            rhizome_id=tree_ev.rhizome_id, anchor_node_id=node_ids[-1], node_ids=node_ids,
+        )
+        await append_and_project(
+            event_store, projector, [tree_ev, first_ev, second_ev, summary_ev],
+        )
+
+        row = await db.fetchone(
+            "SELECT * FROM summaries WHERE summary_id = ?",
+            (summary_ev.payload["summary_id"],),
+        )
+        assert row["node_ids"] == f'["{node_ids[0]}","{node_ids[1]}"]'
+        assert RhizomeService._summary_from_row(row).node_ids == node_ids
+
+    @pytest.mark.parametrize(("column", "index"), [
+        ("anchor_node_id", "idx_summaries_anchor_node_id"),
+        ("rhizome_id", "idx_summaries_rhizome_id"),
+    ])
+    async def test_summary_lookups_use_index(self, db, column, index):
+        """Anchor-node and per-rhizome summary lookups are index searches, not scans."""
+        rows = await db.fetchall(
+            f"EXPLAIN QUERY PLAN SELECT summary_type FROM summaries WHERE {column} = ?",
+            ("x",),
+        )
+        assert any(index in r["detail"] for r in rows)
+
 
 # ---------------------------------------------------------------------------
-# Helper: create a RhizomeService with a mock summary client
+# Helper: a mock summary client and the RhizomeService that uses it
 # ---------------------------------------------------------------------------
 
-def _mock_summary_client(text: str = "Mock summary.", model: str = "claude-haiku-4-5-20251001"):
-    """Create a mock Anthropic client that returns a fixed summary."""
-    mock_client = MagicMock()
-    mock_response = MagicMock()
-    mock_response.content = [MagicMock(text=text)]
-    mock_response.model = model
-    mock_client.messages.create = AsyncMock(return_value=mock_response)
-    return mock_client
+_DEFAULT_SUMMARY_TEXT = "Mock summary."
+_DEFAULT_SUMMARY_MODEL = "claude-haiku-4-5-20251001"
+
+
+def _mock_summary_client(
+    text: str = _DEFAULT_SUMMARY_TEXT, model: str = _DEFAULT_SUMMARY_MODEL,
+):
+    """Create a stand-in Anthropic client whose messages.create returns a fixed summary.
+
+    Only messages.create needs call tracking, so it is the sole mock; the
+    client and response are plain namespaces.
+    """
+    response = SimpleNamespace(content=[SimpleNamespace(text=text)], model=model)
+    return SimpleNamespace(
+        messages=SimpleNamespace(create=AsyncMock(return_value=response)),
+    )
+
+
+def _set_summary_text(mock_client, text: str) -> None:
+    """Change the summary text the mock returns without rebuilding it."""
+    mock_client.messages.create.return_value.content[0].text = text
+
+
+@pytest.fixture(scope="module")
+def _module_summary_client():
+    return _mock_summary_client()
+
+
+@pytest.fixture
+def mock_summary_client(_module_summary_client):
+    """The module's mock client, with calls and summary text reset after each test."""
+    yield _module_summary_client
+    _module_summary_client.messages.create.reset_mock()
+    _set_summary_text(_module_summary_client, _DEFAULT_SUMMARY_TEXT)
+
+
+@pytest.fixture
+def summary_service(db, mock_summary_client):
+    return RhizomeService(db, summary_client=mock_summary_client)
 
 
 # ---------------------------------------------------------------------------
@@ -155,16 +248,15 @@ def _mock_summary_client(text: str = "Mock summary.", model: str = "claude-haiku
 class TestSummaryAPI:
     """API endpoints for manual summarization."""
 
-    async def test_branch_summary(self, client, db):
+    async def test_branch_summary(self, client, db, mock_summary_client, summary_service):
         """POST /summarize with branch scope returns summary."""
         data = await create_rhizome_with_messages(client, n_messages=4)
         rhizome_id = data["rhizome_id"]
         last_node = data["node_ids"][-1]
 
-        mock_client = _mock_summary_client("Branch concise summary.")
-        service = RhizomeService(db, summary_client=mock_client)
+        _set_summary_text(mock_summary_client, "Branch concise summary.")
 
-        result = await service.generate_summary(
+        result = await summary_service.generate_summary(
             rhizome_id, last_node,
             CreateSummaryRequest(scope="branch", summary_type="concise"),
         )
@@ -175,16 +267,15 @@ class TestSummaryAPI:
         assert last_node in result.node_ids
         assert len(result.node_ids) == 4  # All 4 nodes in the branch
 
-    async def test_subtree_summary(self, client, db):
+    async def test_subtree_summary(self, client, db, mock_summary_client, summary_service):
         """POST /summarize with subtree scope returns summary covering descendants."""
         data = await create_rhizome_with_messages(client, n_messages=4)
         rhizome_id = data["rhizome_id"]
         root_node = data["node_ids"][0]
 
-        mock_client = _mock_summary_client("Subtree summary.")
-        service = RhizomeService(db, summary_client=mock_client)
+        _set_summary_text(mock_summary_client, "Subtree summary.")
 
-        result = await service.generate_summary(
+        result = await summary_service.generate_summary(
             rhizome_id, root_node,
             CreateSummaryRequest(scope="subtree", summary_type="detailed"),
         )
@@ -194,16 +285,15 @@ class TestSummaryAPI:
         assert result.anchor_node_id == root_node
         assert len(result.node_ids) == 4  # Root + 3 descendants
 
-    async def test_custom_prompt(self, client, db):
+    async def test_custom_prompt(self, client, db, mock_summary_client, summary_service):
         """POST /summarize with custom prompt passes it through."""
         data = await create_rhizome_with_messages(client, n_messages=2)
         rhizome_id = data["rhizome_id"]
         node_id = data["node_ids"][-1]
 
-        mock_client = _mock_summary_client("Custom result.")
-        service = RhizomeService(db, summary_client=mock_client)
+        _set_summary_text(mock_summary_client, "Custom result.")
 
-        result = await service.generate_summary(
+        result = await summary_service.generate_summary(
             rhizome_id, node_id,
             CreateSummaryRequest(
                 scope="branch",
@@ -216,86 +306,74 @@ class TestSummaryAPI:
         assert result.summary_type == "custom"
 
         # Verify the custom prompt was used as the system prompt
-        call_kwargs = mock_client.messages.create.call_args
+        call_kwargs = mock_summary_client.messages.create.call_args
         assert call_kwargs.kwargs["system"] == "Analyze the emotional dynamics."
 
-    async def test_list_summaries(self, client, db):
+    async def test_list_summaries(self, client, db, summary_service):
         """GET /summaries returns all summaries for tree."""
         data = await create_rhizome_with_messages(client, n_messages=2)
         rhizome_id = data["rhizome_id"]
         node_id = data["node_ids"][-1]
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
         # Generate two summaries
-        await service.generate_summary(
+        await summary_service.generate_summary(
             rhizome_id, node_id,
             CreateSummaryRequest(scope="branch", summary_type="concise"),
         )
-        await service.generate_summary(
+        await summary_service.generate_summary(
             rhizome_id, node_id,
             CreateSummaryRequest(scope="branch", summary_type="detailed"),
         )
 
-        summaries = await service.list_summaries(rhizome_id)
+        summaries = await summary_service.list_summaries(rhizome_id)
         assert len(summaries) == 2
         types = {s.summary_type for s in summaries}
         assert types == {"concise", "detailed"}
 
-    async def test_remove_summary(self, client, db):
+    async def test_remove_summary(self, client, db, summary_service):
         """DELETE /summaries/{id} removes summary."""
         data = await create_rhizome_with_messages(client, n_messages=2)
         rhizome_id = data["rhizome_id"]
         node_id = data["node_ids"][-1]
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
-        result = await service.generate_summary(
+        result = await summary_service.generate_summary(
             rhizome_id, node_id,
             CreateSummaryRequest(scope="branch", summary_type="concise"),
         )
 
-        await service.remove_summary(rhizome_id, result.summary_id)
+        await summary_service.remove_summary(rhizome_id, result.summary_id)
 
-        summaries = await service.list_summaries(rhizome_id)
+        summaries = await summary_service.list_summaries(rhizome_id)
         assert len(summaries) == 0
 
-    async def test_tree_not_found_404(self, client, db):
+    async def test_tree_not_found_404(self, summary_service):
         """Summarize on non-existent tree raises RhizomeNotFoundError."""
         from qivis.rhizomes.service import RhizomeNotFoundError
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
         with pytest.raises(RhizomeNotFoundError):
-            await service.generate_summary(
+            await summary_service.generate_summary(
                 "nonexistent", "nope",
                 CreateSummaryRequest(),
             )
 
-    async def test_node_not_found_404(self, client, db):
+    async def test_node_not_found_404(self, event_store, projector, summary_service):
         """Summarize on non-existent node raises NodeNotFoundError."""
         from qivis.rhizomes.service import NodeNotFoundError
 
-        data = await create_rhizome_with_messages(client, n_messages=1)
+        data = await seed_linear_branch(event_store, projector, n_messages=1)
         rhizome_id = data["rhizome_id"]
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
         with pytest.raises(NodeNotFoundError):
-            await service.generate_summary(
+            await summary_service.generate_summary(
                 rhizome_id, "nonexistent-node",
                 CreateSummaryRequest(),
             )
 
-    async def test_no_summary_client_503(self, client, db):
+    async def test_no_summary_client_503(self, db, event_store, projector):
         """Summarize without summary client raises SummaryClientNotConfiguredError."""
         from qivis.rhizomes.service import SummaryClientNotConfiguredError
 
-        data = await create_rhizome_with_messages(client, n_messages=1)
+        data = await seed_linear_branch(event_store, projector, n_messages=1)
         rhizome_id = data["rhizome_id"]
         node_id = data["node_ids"][0]
 
@@ -307,11 +385,11 @@ class TestSummaryAPI:
                 CreateSummaryRequest(),
             )
 
-    async def test_remove_nonexistent_summary_404(self, client, db):
+    async def test_remove_nonexistent_summary_404(self, db, event_store, projector):
         """Remove non-existent summary raises SummaryNotFoundError."""
         from qivis.rhizomes.service import SummaryNotFoundError
 
-        data = await create_rhizome_with_messages(client, n_messages=1)
+        data = await seed_rhizome(event_store, projector)
         rhizome_id = data["rhizome_id"]
 
         service = RhizomeService(db, summary_client=None)
@@ -328,52 +406,41 @@ class TestSummaryAPI:
 class TestSummaryAlgorithm:
     """Verify transcript building, scope logic, and prompt selection."""
 
-    async def test_branch_walks_parent_chain(self, client, db):
+    async def test_branch_walks_parent_chain(self, event_store, projector, summary_service):
         """Branch scope walks the correct parent chain from leaf to root."""
-        data = await create_rhizome_with_messages(client, n_messages=5)
+        data = await seed_linear_branch(event_store, projector, n_messages=5)
         rhizome_id = data["rhizome_id"]
         leaf = data["node_ids"][-1]
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
-        result = await service.generate_summary(
+        result = await summary_service.generate_summary(
             rhizome_id, leaf,
             CreateSummaryRequest(scope="branch"),
         )
         # Branch from leaf to root should include all 5 nodes in order
         assert result.node_ids == data["node_ids"]
 
-    async def test_subtree_collects_all_descendants(self, client, db):
+    async def test_subtree_collects_all_descendants(
+        self, event_store, projector, summary_service,
+    ):
         """Subtree scope collects all descendants including branches."""
         # Create tree: root -> A, root -> B (two children of root)
-        tree = await create_test_rhizome(client, title="Branching")
-        rhizome_id = tree["rhizome_id"]
-
-        # Root node
-        resp = await client.post(
-            f"/api/rhizomes/{rhizome_id}/nodes",
-            json={"content": "Root", "role": "user"},
+        seeded = await seed_rhizome(
+            event_store, projector,
+            title="Branching",
+            nodes=[{"role": "user", "content": "Root"}],
         )
-        root_id = resp.json()["node_id"]
+        rhizome_id = seeded["rhizome_id"]
+        root_id = seeded["node_ids"][0]
 
         # Two children
-        resp = await client.post(
-            f"/api/rhizomes/{rhizome_id}/nodes",
-            json={"content": "Child A", "role": "assistant", "parent_id": root_id},
+        child_a = await add_node(
+            event_store, projector, rhizome_id, "Child A", "assistant", parent_id=root_id,
         )
-        child_a = resp.json()["node_id"]
-
-        resp = await client.post(
-            f"/api/rhizomes/{rhizome_id}/nodes",
-            json={"content": "Child B", "role": "assistant", "parent_id": root_id},
+        child_b = await add_node(
+            event_store, projector, rhizome_id, "Child B", "assistant", parent_id=root_id,
         )
-        child_b = resp.json()["node_id"]
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
-        result = await service.generate_summary(
+        result = await summary_service.generate_summary(
             rhizome_id, root_id,
             CreateSummaryRequest(scope="subtree"),
         )
@@ -382,39 +449,40 @@ class TestSummaryAlgorithm:
         assert child_a in result.node_ids
         assert child_b in result.node_ids
 
-    async def test_summary_type_selects_prompt(self, client, db):
+    async def test_summary_type_selects_prompt(
+        self, event_store, projector, mock_summary_client, summary_service,
+    ):
         """Different summary types use different system prompts and max_tokens."""
-        data = await create_rhizome_with_messages(client, n_messages=2)
+        data = await seed_linear_branch(event_store, projector, n_messages=2)
         rhizome_id = data["rhizome_id"]
         node_id = data["node_ids"][-1]
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
         # Concise
-        await service.generate_summary(
+        await summary_service.generate_summary(
             rhizome_id, node_id,
             CreateSummaryRequest(summary_type="concise"),
         )
-        call = mock_client.messages.create.call_args
+        call = mock_summary_client.messages.create.call_args
         assert call.kwargs["max_tokens"] == 300
         assert "terse" in call.kwargs["system"].lower()
         assert "30-50 words" in call.kwargs["system"]
 
-        mock_client.messages.create.reset_mock()
+        mock_summary_client.messages.create.reset_mock()
 
         # Key points
-        await service.generate_summary(
+        await summary_service.generate_summary(
             rhizome_id, node_id,
             CreateSummaryRequest(summary_type="key_points"),
         )
-        call = mock_client.messages.create.call_args
+        call = mock_summary_client.messages.create.call_args
         assert call.kwargs["max_tokens"] == 1024
         assert "key points" in call.kwargs["system"].lower()
 
-    async def test_edited_content_used_in_transcript(self, client, db):
+    async def test_edited_content_used_in_transcript(
+        self, client, event_store, projector, mock_summary_client, summary_service,
+    ):
         """Transcript uses edited_content when present."""
-        data = await create_rhizome_with_messages(client, n_messages=2)
+        data = await seed_linear_branch(event_store, projector, n_messages=2)
         rhizome_id = data["rhizome_id"]
         node_id = data["node_ids"][0]
 
@@ -424,16 +492,13 @@ class TestSummaryAlgorithm:
             json={"edited_content": "Edited hello"},
         )
 
-        mock_client = _mock_summary_client()
-        service = RhizomeService(db, summary_client=mock_client)
-
-        await service.generate_summary(
+        await summary_service.generate_summary(
             rhizome_id, data["node_ids"][-1],
             CreateSummaryRequest(scope="branch"),
         )
 
         # Check the transcript passed to the mock
-        call = mock_client.messages.create.call_args
+        call = mock_summary_client.messages.create.call_args
         user_message = call.kwargs["messages"][0]["content"]
         assert "Edited hello" in user_message
 
@@ -448,19 +513,18 @@ class TestSummaryAlgorithm:
         )
 
         all_events = [tree_ev, node_ev, summary_ev]
-        for e in all_events:
-            await event_store.append(e)
+        await event_store.append_many(all_events)
 
         # Clear tables and replay
-        await db.execute("DELETE FROM summaries")
-        await db.execute("DELETE FROM nodes")
-        await db.execute("DELETE FROM rhizomes")
+        await db.executescript(
+            "BEGIN; DELETE FROM summaries; DELETE FROM nodes; DELETE FROM rhizomes; COMMIT;"
+        )
 
         fresh_projector = StateProjector(db)
         await fresh_projector.project(all_events)
 
         row = await db.fetchone(
-            "SELECT * FROM summaries WHERE summary_id = ?",
+            "SELECT summary FROM summaries WHERE summary_id = ?",
             (summary_ev.payload["summary_id"],),
         )
         assert row is not None
@@ -9,15 +9,30 @@ Three sections:
 import pytest
 
 from qivis.events.projector import StateProjector
-from qivis.events.store import EventStore
-from qivis.rhizomes.service import RhizomeNotFoundError, RhizomeService
+from qivis.rhizomes.service import RhizomeNotFoundError
 from tests.fixtures import (
+    append_and_project,
     create_test_rhizome,
     make_rhizome_archived_envelope,
     make_rhizome_created_envelope,
     make_rhizome_unarchived_envelope,
 )
 
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+# Tests share one module database; its tables are wiped after each test.
+pytestmark = pytest.mark.shared_db
+
+
+async def _seed_archived_rhizome(event_store, projector) -> str:
+    """Create and archive a rhizome via events. Returns its rhizome_id."""
+    tree_ev = make_rhizome_created_envelope(title="Archivable")
+    archive_ev = make_rhizome_archived_envelope(rhizome_id=tree_ev.rhizome_id)
+    await append_and_project(event_store, projector, [tree_ev, archive_ev])
+    return tree_ev.rhizome_id
+
 
 # ---------------------------------------------------------------------------
 # Contract tests: event -> store -> projector -> verify state
@@ -30,12 +45,8 @@ class TestArchiveProjection:
     async def test_tree_archived_sets_flag(self, event_store, projector, db):
         """TreeArchived sets archived = 1 in the trees table."""
         tree_ev = make_rhizome_created_envelope()
-        await event_store.append(tree_ev)
-        await projector.project([tree_ev])
-
         archive_ev = make_rhizome_archived_envelope(rhizome_id=tree_ev.rhizome_id, reason="done")
-        await event_store.append(archive_ev)
-        await projector.project([archive_ev])
+        await append_and_project(event_store, projector, [tree_ev, archive_ev])
 
         row = await db.fetchone(
             "SELECT archived FROM rhizomes WHERE rhizome_id = ?",
@@ -47,16 +58,9 @@ class TestArchiveProjection:
     async def test_tree_unarchived_clears_flag(self, event_store, projector, db):
         """TreeUnarchived sets archived = 0 in the trees table."""
         tree_ev = make_rhizome_created_envelope()
-        await event_store.append(tree_ev)
-        await projector.project([tree_ev])
-
         archive_ev = make_rhizome_archived_envelope(rhizome_id=tree_ev.rhizome_id)
-        await event_store.append(archive_ev)
-        await projector.project([archive_ev])
-
         unarchive_ev = make_rhizome_unarchived_envelope(rhizome_id=tree_ev.rhizome_id)
-        await event_store.append(unarchive_ev)
-        await projector.project([unarchive_ev])
+        await append_and_project(event_store, projector, [tree_ev, archive_ev, unarchive_ev])
 
         row = await db.fetchone(
             "SELECT archived FROM rhizomes WHERE rhizome_id = ?",
@@ -71,8 +75,7 @@ class TestArchiveProjection:
         archive_ev = make_rhizome_archived_envelope(rhizome_id=tree_ev.rhizome_id)
 
         all_events = [tree_ev, archive_ev]
-        for e in all_events:
-            await event_store.append(e)
+        await event_store.append_many(all_events)
 
         # Clear and replay
         await db.execute("DELETE FROM rhizomes")
@@ -105,34 +108,26 @@ class TestArchiveAPI:
         data = resp.json()
         assert data["archived"] == 1
 
-    async def test_archived_tree_excluded_from_list(self, client, db):
+    async def test_archived_tree_excluded_from_list(self, client, event_store, projector):
         """Archived tree is excluded from GET /trees by default."""
-        tree = await create_test_rhizome(client, title="Archivable")
-        rhizome_id = tree["rhizome_id"]
-
-        await client.post(f"/api/rhizomes/{rhizome_id}/archive")
+        rhizome_id = await _seed_archived_rhizome(event_store, projector)
 
         resp = await client.get("/api/rhizomes")
         rhizome_ids = [t["rhizome_id"] for t in resp.json()]
         assert rhizome_id not in rhizome_ids
 
-    async def test_include_archived_query_param(self, client, db):
+    async def test_include_archived_query_param(self, client, event_store, projector):
         """GET /trees?include_archived=true includes archived trees."""
-        tree = await create_test_rhizome(client, title="Archivable")
-        rhizome_id = tree["rhizome_id"]
-
-        await client.post(f"/api/rhizomes/{rhizome_id}/archive")
+        rhizome_id = await _seed_archived_rhizome(event_store, projector)
 
         resp = await client.get("/api/rhizomes?include_archived=true")
         rhizome_ids = [t["rhizome_id"] for t in resp.json()]
         assert rhizome_id in rhizome_ids
 
-    async def test_unarchive_tree(self, client, db):
+    async def test_unarchive_tree(self, client, event_store, projector):
         """POST /unarchive restores tree to the list."""
-        tree = await create_test_rhizome(client, title="Restoring")
-        rhizome_id = tree["rhizome_id"]
+        rhizome_id = await _seed_archived_rhizome(event_store, projector)
 
-        await client.post(f"/api/rhizomes/{rhizome_id}/archive")
         resp = await client.post(f"/api/rhizomes/{rhizome_id}/unarchive")
         assert resp.status_code == 200
         assert resp.json()["archived"] == 0
@@ -211,17 +206,13 @@ class TestRhizomeSummaryEnrichment:
         assert found["folders"] == ["Research"]
         assert found["tags"] == ["wip"]
 
-    async def test_archived_field_in_summary(self, client, db):
+    async def test_archived_field_in_summary(self, client, event_store, projector):
         """RhizomeSummary includes archived field."""
-        tree = await create_test_rhizome(client, title="Archive Check")
-        rhizome_id = tree["rhizome_id"]
-
-        resp = await client.get("/api/rhizomes")
-        found = next(t for t in resp.json() if t["rhizome_id"] == rhizome_id)
-        assert found["archived"] == 0
-
-        await client.post(f"/api/rhizomes/{rhizome_id}/archive")
+        live_ev = make_rhizome_created_envelope(title="Archive Check")
+        await append_and_project(event_store, projector, [live_ev])
+        archived_id = await _seed_archived_rhizome(event_store, projector)
 
         resp = await client.get("/api/rhizomes?include_archived=true")
-        found = next(t for t in resp.json() if t["rhizome_id"] == rhizome_id)
-        assert found["archived"] == 1
+        archived = {t["rhizome_id"]: t["archived"] for t in resp.json()}
+        assert archived[live_ev.rhizome_id] == 0
+        assert archived[archived_id] == 1
@@ -0,0 +1,316 @@
+"""Contract tests for the OpenAI-compatible local providers with a mocked AsyncOpenAI client.
+
+GenericOpenAIProvider and OllamaProvider share one chat-completions code path,
+so the generation, streaming and model-discovery tests run against both; only
+identity and sampling-parameter handling are tested per provider.
+"""
+
+import functools
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from qivis.models import SamplingParams
+from qivis.providers.base import GenerationRequest
+from qivis.providers.generic_openai import GenericOpenAIProvider
+from qivis.providers.ollama import OllamaProvider
+from qivis.providers.openai_compat import OpenAICompatibleProvider
+
+# -- Helpers (same pattern as test_openai_provider.py) --
+
+
+# The completion and chunk builders are cached per argument set: providers
+# only read these mocks, so tests share one tree instead of rebuilding it.
+@functools.cache
+def _make_mock_completion(
+    content: str = "Hello from local!",
+    model: str = "test-model",
+    finish_reason: str = "stop",
+    prompt_tokens: int = 10,
+    completion_tokens: int = 5,
+) -> MagicMock:
+    choice = MagicMock()
+    choice.message = MagicMock()
+    choice.message.content = content
+    choice.finish_reason = finish_reason
+    choice.logprobs = None
+
+    usage = MagicMock()
+    usage.prompt_tokens = prompt_tokens
+    usage.completion_tokens = completion_tokens
+
+    completion = MagicMock()
+    completion.choices = [choice]
+    completion.model = model
+    completion.usage = usage
+    completion.model_dump.return_value = {
+        "id": "test", "choices": [{"message": {"content": content}}],
+    }
+    return completion
+
+
+@functools.cache
+def _make_mock_stream_chunks(
+    text: str = "Hello world!",
+    model: str = "test-model",
+    prompt_tokens: int = 10,
+    completion_tokens: int = 5,
+) -> list[SimpleNamespace]:
+    # Plain namespaces: the stream loop only reads a handful of attributes.
+    def chunk(content: str | None, finish_reason: str | None) -> SimpleNamespace:
+        choice = SimpleNamespace(
+            delta=SimpleNamespace(content=content),
+            finish_reason=finish_reason,
+            logprobs=None,
+        )
+        return SimpleNamespace(choices=[choice], model=model, usage=None)
+
+    usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    return [
+        # Role chunk
+        chunk(None, None),
+        # Content chunk
+        chunk(text, None),
+        # Finish chunk
+        chunk(None, "stop"),
+        # Usage chunk
+        SimpleNamespace(choices=[], model=model, usage=usage),
+    ]
+
+
+class _Recorder:
+    """Async stand-in for ``chat.completions.create`` that records its kwargs.
+
+    Cheaper than an AsyncMock for tests that only inspect the last call.
+    """
+
+    def __init__(self, return_value: Any) -> None:
+        self.calls: list[dict[str, Any]] = []
+        self.return_value = return_value
+
+    async def __call__(self, **kwargs: Any) -> Any:
+        self.calls.append(kwargs)
+        return self.return_value
+
+
+def _make_mock_client(completion: MagicMock | None = None) -> AsyncMock:
+    client = AsyncMock()
+    client.chat = MagicMock()
+    client.chat.completions = MagicMock()
+    client.chat.completions.create = _Recorder(completion or _make_mock_completion())
+    return client
+
+
+@pytest.fixture(scope="module")
+def _shared_client() -> AsyncMock:
+    return _make_mock_client()
+
+
+@pytest.fixture
+def mock_client(_shared_client: AsyncMock) -> Any:
+    """The module's mock client; call records and canned completion reset after each test."""
+    yield _shared_client
+    create = _shared_client.chat.completions.create
+    create.calls.clear()
+    create.return_value = _make_mock_completion()
+
+
+# Shared by every request that doesn't pass its own; providers only read it.
+_DEFAULT_SAMPLING_PARAMS = SamplingParams(temperature=0.7, max_tokens=1024)
+
+
+def _make_request(
+    model: str = "test-model",
+    sampling_params: SamplingParams | None = None,
+) -> GenerationRequest:
+    return GenerationRequest(
+        model=model,
+        messages=[{"role": "user", "content": "Hello"}],
+        sampling_params=sampling_params or _DEFAULT_SAMPLING_PARAMS,
+    )
+
+
+class _ListAsyncIter:
+    """Async iterator over a prepared list, standing in for an SDK stream."""
+
+    def __init__(self, items: list) -> None:
+        self._it = iter(items)
+
+    def __aiter__(self) -> _ListAsyncIter:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return next(self._it)
+        except StopIteration:
+            raise StopAsyncIteration from None
+
+
+def _generic_provider(client: Any) -> GenericOpenAIProvider:
+    return GenericOpenAIProvider(client=client, base_url="http://localhost:5000/v1")
+
+
+def _ollama_provider(client: Any) -> OllamaProvider:
+    return OllamaProvider(client=client)
+
+
+@pytest.fixture(scope="module")
+def generic_provider(_shared_client: AsyncMock) -> GenericOpenAIProvider:
+    """One unnamed generic provider over the module's mock client."""
+    return _generic_provider(_shared_client)
+
+
+@pytest.fixture(scope="module")
+def ollama_provider(_shared_client: AsyncMock) -> OllamaProvider:
+    """One Ollama provider over the module's mock client."""
+    return _ollama_provider(_shared_client)
+
+
+@pytest.fixture(
+    params=[_generic_provider, _ollama_provider],
+    ids=["generic", "ollama"],
+)
+def make_provider(request) -> Callable[[Any], OpenAICompatibleProvider]:
+    """Build each OpenAI-compatible local provider around a given client."""
+    return request.param
+
+
+# -- Shared behaviour --
+
+
+class TestOpenAILikeGenerate:
+    async def test_returns_correct_content(self, make_provider, mock_client):
+        mock_client.chat.completions.create.return_value = _make_mock_completion("Generated text")
+        provider = make_provider(mock_client)
+        result = await provider.generate(_make_request())
+        assert result.content == "Generated text"
+
+    async def test_returns_usage(self, make_provider, mock_client):
+        mock_client.chat.completions.create.return_value = _make_mock_completion(
+            prompt_tokens=20, completion_tokens=8,
+        )
+        provider = make_provider(mock_client)
+        result = await provider.generate(_make_request())
+        assert result.usage == {"input_tokens": 20, "output_tokens": 8}
+
+
+class TestOpenAILikeGenerateStream:
+    async def test_yields_text_deltas_and_final(self, make_provider):
+        chunks = _make_mock_stream_chunks("Streamed!")
+        client = AsyncMock()
+        client.chat = MagicMock()
+        client.chat.completions = MagicMock()
+        client.chat.completions.create = AsyncMock(return_value=_ListAsyncIter(chunks))
+
+        provider = make_provider(client)
+        received = []
+        async for chunk in provider.generate_stream(_make_request()):
+            received.append(chunk)
+
+        text_chunks = [c for c in received if c.type == "text_delta"]
+        assert len(text_chunks) > 0
+
+        final = [c for c in received if c.is_final]
+        assert len(final) == 1
+        assert final[0].result is not None
+        assert final[0].result.content == "Streamed!"
+
+
+class TestOpenAILikeDiscoverModels:
+    async def test_returns_sorted_model_list(self, make_provider):
+        client = _make_mock_client()
+        # Mock client.models.list() to return model objects
+        model_a = MagicMock()
+        model_a.id = "mistral:latest"
+        model_b = MagicMock()
+        model_b.id = "llama3.2:latest"
+        model_c = MagicMock()
+        model_c.id = "codellama:13b"
+
+        response = MagicMock()
+        response.data = [model_a, model_b, model_c]
+        client.models = MagicMock()
+        client.models.list = AsyncMock(return_value=response)
+
+        provider = make_provider(client)
+        models = await provider.discover_models()
+        assert models == ["codellama:13b", "llama3.2:latest", "mistral:latest"]
+
+    async def test_returns_empty_list_on_error(self, make_provider):
+        client = _make_mock_client()
+        client.models = MagicMock()
+        client.models.list = AsyncMock(side_effect=ConnectionError("Server down"))
+
+        provider = make_provider(client)
+        models = await provider.discover_models()
+        assert models == []
+
+
+# -- GenericOpenAIProvider --
+
+
+class TestGenericOpenAIProviderIdentity:
+    def test_name_returns_configured_name(self, mock_client):
+        provider = GenericOpenAIProvider(
+            client=mock_client,
+            base_url="http://localhost:5000/v1",
+            provider_name="vllm-server",
+        )
+        assert provider.name == "vllm-server"
+
+    def test_name_defaults_to_local(self, generic_provider):
+        assert generic_provider.name == "local"
+
+    def test_top_k_not_in_supported_params(self, generic_provider):
+        """GenericOpenAI inherits standard OpenAI behavior — no top_k."""
+        assert "top_k" not in generic_provider.supported_params
+
+
+class TestGenericOpenAIParamBuilding:
+    async def test_top_k_not_passed_to_api(self, generic_provider, mock_client):
+        """top_k should not appear in API call params (standard OpenAI behavior)."""
+        await generic_provider.generate(
+            _make_request(sampling_params=SamplingParams(top_k=40, max_tokens=512))
+        )
+        call_kwargs = mock_client.chat.completions.create.calls[-1]
+        assert "top_k" not in call_kwargs
+
+
+# -- OllamaProvider --
+
+
+class TestOllamaProviderIdentity:
+    def test_name_returns_ollama(self, ollama_provider):
+        assert ollama_provider.name == "ollama"
+
+    def test_supported_params_includes_top_k(self, ollama_provider):
+        assert "top_k" in ollama_provider.supported_params
+
+    def test_supported_params_includes_standard_params(self, ollama_provider):
+        standard = ["temperature", "top_p", "max_tokens", "frequency_penalty", "presence_penalty"]
+        for param in standard:
+            assert param in ollama_provider.supported_params
+
+
+class TestOllamaParamBuilding:
+    async def test_passes_top_k_when_set(self, ollama_provider, mock_client):
+        await ollama_provider.generate(
+            _make_request(sampling_params=SamplingParams(top_k=40, max_tokens=512))
+        )
+        call_kwargs = mock_client.chat.completions.create.calls[-1]
+        assert call_kwargs.get("top_k") == 40
+
+    async def test_omits_top_k_when_not_set(self, ollama_provider, mock_client):
+        await ollama_provider.generate(_make_request())
+        call_kwargs = mock_client.chat.completions.create.calls[-1]
+        assert "top_k" not in call_kwargs
+
+    async def test_passes_temperature(self, ollama_provider, mock_client):
+        await ollama_provider.generate(
+            _make_request(sampling_params=SamplingParams(temperature=0.5, max_tokens=512))
+        )
+        call_kwargs = mock_client.chat.completions.create.calls[-1]
+        assert call_kwargs["temperature"] == 0.5
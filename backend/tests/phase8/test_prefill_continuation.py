@@ -5,17 +5,17 @@ there. The prefill text is stored separately from the model's continuation,
 but the full combined text is what goes into future context.
 """
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Iterator
 from uuid import uuid4
 
 import pytest
+import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 
 from qivis.db.connection import Database
 from qivis.events.projector import StateProjector
 from qivis.events.store import EventStore
 from qivis.generation.service import GenerationService
-from qivis.main import app
 from qivis.models import (
     GenerationStartedPayload,
     NodeCreatedPayload,
@@ -27,16 +27,20 @@ from qivis.providers.base import (
     LLMProvider,
     StreamChunk,
 )
-from qivis.providers.registry import clear_providers, register_provider
-from qivis.rhizomes.router import get_generation_service, get_rhizome_service
 from qivis.rhizomes.schemas import GenerateRequest, NodeResponse
 from qivis.rhizomes.service import RhizomeService
 from tests.fixtures import (
+    append_and_project,
     create_test_rhizome,
     make_node_created_envelope,
     make_rhizome_created_envelope,
+    override_dependencies,
+    registered_providers,
 )
 
+# Tests share one module database; its tables are wiped after each test.
+pytestmark = pytest.mark.shared_db
+
 
 # ---------------------------------------------------------------------------
 # Test provider that captures its input and returns canned continuation
@@ -84,17 +88,35 @@ class CapturingProvider(LLMProvider):
         )
 
 
+@pytest.fixture(scope="module")
+def _shared_provider() -> CapturingProvider:
+    return CapturingProvider(continuation=" is wonderful.")
+
+
+@pytest.fixture
+def capturing_provider(_shared_provider: CapturingProvider) -> Iterator[CapturingProvider]:
+    """Module-wide CapturingProvider, with the captured request cleared after each test."""
+    yield _shared_provider
+    _shared_provider.last_request = None
+
+
 # ===================================================================
 # Part 1: Contract tests — payload models
 # ===================================================================
 
 
+# The payload tests only need well-formed ids, not unique ones.
+_NODE_ID = str(uuid4())
+_GENERATION_ID = str(uuid4())
+_PARENT_NODE_ID = str(uuid4())
+
+
 class TestPrefillPayloadModels:
     """Verify that the payload models accept prefill mode and content."""
 
     def test_node_created_payload_accepts_prefill_mode(self):
         payload = NodeCreatedPayload(
-            node_id=str(uuid4()),
+            node_id=_NODE_ID,
             role="assistant",
             content="I think this is great.",
             mode="prefill",
@@ -103,7 +125,7 @@ class TestPrefillPayloadModels:
 
     def test_node_created_payload_accepts_prefill_content(self):
         payload = NodeCreatedPayload(
-            node_id=str(uuid4()),
+            node_id=_NODE_ID,
             role="assistant",
             content="I think this is great.",
             prefill_content="I think",
@@ -112,7 +134,7 @@ class TestPrefillPayloadModels:
 
     def test_node_created_payload_prefill_content_defaults_none(self):
         payload = NodeCreatedPayload(
-            node_id=str(uuid4()),
+            node_id=_NODE_ID,
             role="assistant",
             content="Hello",
         )
@@ -120,8 +142,8 @@ class TestPrefillPayloadModels:
 
     def test_generation_started_payload_accepts_prefill_mode(self):
         payload = GenerationStartedPayload(
-            generation_id=str(uuid4()),
-            parent_node_id=str(uuid4()),
+            generation_id=_GENERATION_ID,
+            parent_node_id=_PARENT_NODE_ID,
             model="claude-sonnet-4-5-20250929",
             provider="anthropic",
             mode="prefill",
@@ -130,8 +152,8 @@ class TestPrefillPayloadModels:
 
     def test_generation_started_payload_accepts_prefill_content(self):
         payload = GenerationStartedPayload(
-            generation_id=str(uuid4()),
-            parent_node_id=str(uuid4()),
+            generation_id=_GENERATION_ID,
+            parent_node_id=_PARENT_NODE_ID,
             model="claude-sonnet-4-5-20250929",
             provider="anthropic",
             prefill_content="I think",
@@ -155,9 +177,9 @@ class TestPrefillPayloadModels:
 class TestPrefillProjection:
     """Verify that prefill_content is stored and retrieved from the nodes table."""
 
-    @pytest.fixture
+    @pytest_asyncio.fixture
     async def projected(self, db: Database):
-        """Project a rhizome with a prefill node, return (projector, rhizome_id, node_id)."""
+        """Project a rhizome with a prefill node, return (nodes, prefill_node_row)."""
         store = EventStore(db)
         projector = StateProjector(db)
 
@@ -179,22 +201,17 @@ class TestPrefillProjection:
             prefill_content="I think",
         )
 
-        for ev in [tree_ev, user_ev, prefill_ev]:
-            await store.append(ev)
-        await projector.project([tree_ev, user_ev, prefill_ev])
+        await append_and_project(store, projector, [tree_ev, user_ev, prefill_ev])
 
-        return projector, rhizome_id, node_id
+        nodes = await projector.get_nodes(rhizome_id)
+        return nodes, next(n for n in nodes if n["node_id"] == node_id)
 
     async def test_prefill_content_projected(self, projected):
-        projector, rhizome_id, node_id = projected
-        nodes = await projector.get_nodes(rhizome_id)
-        node = next(n for n in nodes if n["node_id"] == node_id)
+        _, node = projected
         assert node["prefill_content"] == "I think"
 
     async def test_prefill_mode_projected(self, projected):
-        projector, rhizome_id, node_id = projected
-        nodes = await projector.get_nodes(rhizome_id)
-        node = next(n for n in nodes if n["node_id"] == node_id)
+        _, node = projected
         assert node["mode"] == "prefill"
 
     async def test_null_prefill_content_projected(self, db: Database):
@@ -207,9 +224,7 @@ class TestPrefillProjection:
         node_ev = make_node_created_envelope(
             rhizome_id=rhizome_id, node_id=node_id, role="user", content="Hello",
         )
-        for ev in [tree_ev, node_ev]:
-            await store.append(ev)
-        await projector.project([tree_ev, node_ev])
+        await append_and_project(store, projector, [tree_ev, node_ev])
 
         nodes = await projector.get_nodes(rhizome_id)
         node = next(n for n in nodes if n["node_id"] == node_id)
@@ -217,9 +232,7 @@ class TestPrefillProjection:
 
     async def test_prefill_content_on_node_response(self, projected):
         """NodeResponse includes prefill_content."""
-        projector, rhizome_id, node_id = projected
-        nodes = await projector.get_nodes(rhizome_id)
-        node_row = next(n for n in nodes if n["node_id"] == node_id)
+        nodes, node_row = projected
         sibling_info = RhizomeService._compute_sibling_info(nodes)
         resp = RhizomeService._node_from_row(node_row, sibling_info=sibling_info)
         assert resp.prefill_content == "I think"
@@ -234,8 +247,8 @@ class TestPrefillGenerationService:
     """Verify that the generation service injects the trailing assistant
     message, concatenates the result, and sets mode/prefill_content."""
 
-    @pytest.fixture
-    async def service_env(self, db: Database):
+    @pytest_asyncio.fixture
+    async def service_env(self, db: Database, capturing_provider):
         """Set up a rhizome with a user node and return (gen_service, provider, rhizome_id, user_node_id)."""
         store = EventStore(db)
         projector = StateProjector(db)
@@ -249,12 +262,9 @@ class TestPrefillGenerationService:
         user_ev = make_node_created_envelope(
             rhizome_id=rhizome_id, node_id=user_id, role="user", content="What do you think?",
         )
-        for ev in [tree_ev, user_ev]:
-            await store.append(ev)
-        await projector.project([tree_ev, user_ev])
+        await append_and_project(store, projector, [tree_ev, user_ev])
 
-        provider = CapturingProvider(continuation=" is wonderful.")
-        return gen_service, provider, rhizome_id, user_id
+        return gen_service, capturing_provider, rhizome_id, user_id
 
     async def test_prefill_injects_trailing_assistant_message(self, service_env):
         gen_service, provider, rhizome_id, user_id = service_env
@@ -308,29 +318,38 @@ class TestPrefillGenerationService:
 # ===================================================================
 
 
-@pytest.fixture
-async def prefill_client(db: Database) -> AsyncIterator[tuple[AsyncClient, CapturingProvider]]:
-    """Test client with CapturingProvider wired in."""
-    store = EventStore(db)
-    projector = StateProjector(db)
-    service = RhizomeService(db)
-    gen_service = GenerationService(service, store, projector)
+@pytest_asyncio.fixture(scope="module")
+async def _prefill_app_client(
+    _module_db: Database, _shared_provider: CapturingProvider,
+) -> AsyncIterator[AsyncClient]:
+    """One ASGI client per module with CapturingProvider wired in."""
+    # Imported here so the payload and projection tests run without loading the app.
+    from qivis.main import app
+    from qivis.rhizomes.router import get_generation_service, get_rhizome_service
 
-    provider = CapturingProvider(continuation=" is wonderful.")
-    clear_providers()
-    register_provider(provider)
+    store = EventStore(_module_db)
+    projector = StateProjector(_module_db)
+    service = RhizomeService(_module_db)
+    gen_service = GenerationService(service, store, projector)
 
-    app.dependency_overrides[get_rhizome_service] = lambda: service
-    app.dependency_overrides[get_generation_service] = lambda: gen_service
+    overrides = {
+        get_rhizome_service: lambda: service,
+        get_generation_service: lambda: gen_service,
+    }
+    with registered_providers(_shared_provider), override_dependencies(app, overrides):
+        async with AsyncClient(
+            transport=ASGITransport(app=app),
+            base_url="http://test",
+        ) as client:
+            yield client
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test",
-    ) as client:
-        yield client, provider
 
-    app.dependency_overrides.clear()
-    clear_providers()
+@pytest.fixture
+def prefill_client(
+    _prefill_app_client: AsyncClient, capturing_provider: CapturingProvider,
+) -> tuple[AsyncClient, CapturingProvider]:
+    """The module client and provider; captured request reset after each test."""
+    return _prefill_app_client, capturing_provider
 
 
 class TestPrefillContinuationAPI:
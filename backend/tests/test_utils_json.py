@@ -1,6 +1,14 @@
 """Tests for consolidated JSON parsing utilities (Interlude)."""
 
-from qivis.utils.json import json_str, parse_json_field, parse_json_or_none
+import json
+
+from qivis.utils.json import (
+    _NORMALIZE_CACHE_MAX_LEN,
+    _normalize_json_text_cached,
+    json_str,
+    parse_json_field,
+    parse_json_or_none,
+)
 
 
 class TestParseJsonField:
@@ -21,6 +29,10 @@ class TestParseJsonField:
     def test_empty_string_returns_none(self):
         assert parse_json_field("") is None
 
+    def test_empty_object_string_returns_none(self):
+        assert parse_json_field("{}") is None
+        assert parse_json_field("{ }") is None
+
     def test_invalid_json_returns_none(self):
         assert parse_json_field("not json") is None
 
@@ -32,6 +44,13 @@ class TestParseJsonField:
         result = parse_json_field('{"a": {"b": 1}}')
         assert result == {"a": {"b": 1}}
 
+    def test_leading_whitespace_dict_string(self):
+        assert parse_json_field('  \n{"key": 1}') == {"key": 1}
+
+    def test_json_scalar_returns_none(self):
+        assert parse_json_field("42") is None
+        assert parse_json_field('"text"') is None
+
 
 class TestParseJsonOrNone:
     """parse_json_or_none: permissive parser for node fields (dicts, lists)."""
@@ -59,6 +78,16 @@ class TestParseJsonOrNone:
     def test_empty_string_returns_none(self):
         assert parse_json_or_none("") is None
 
+    def test_whitespace_only_returns_none(self):
+        assert parse_json_or_none("  \n") is None
+
+    def test_json_scalars_still_parse(self):
+        """The first-character pre-check must not reject valid JSON scalars."""
+        assert parse_json_or_none(" 42") == 42
+        assert parse_json_or_none("-1.5") == -1.5
+        assert parse_json_or_none('"text"') == "text"
+        assert parse_json_or_none("true") is True
+
 
 class TestJsonStr:
     """json_str: serialize to JSON string for CSV cells."""
@@ -74,6 +103,10 @@ class TestJsonStr:
     def test_list_serializes(self):
         assert json_str([1, 2]) == "[1, 2]"
 
+    def test_empty_containers_serialize(self):
+        assert json_str([]) == "[]"
+        assert json_str({}) == "{}"
+
     def test_json_string_roundtrips(self):
         """A valid JSON string is parsed then re-serialized (normalized)."""
         result = json_str('{"a":  1}')
@@ -82,3 +115,26 @@ class TestJsonStr:
     def test_non_json_string_passthrough(self):
         """Non-JSON strings pass through unchanged."""
         assert json_str("plain text") == "plain text"
+
+    def test_text_starting_like_json_passthrough(self):
+        """Strings that only look like JSON at the start still pass through."""
+        assert json_str("no comment") == "no comment"
+        assert json_str("[draft] notes") == "[draft] notes"
+
+    def test_repeated_json_string_normalizes_consistently(self):
+        """Repeated short cells normalize to the same text every time."""
+        raw = '{"temperature":  0.7}'
+        assert json_str(raw) == '{"temperature": 0.7}'
+        assert json_str(raw) == '{"temperature": 0.7}'
+
+    def test_large_json_string_normalizes_without_caching(self):
+        """Strings over the cache cutoff are normalized but never cached."""
+        _normalize_json_text_cached.cache_clear()
+        raw = json.dumps({"tokens": ["x"] * _NORMALIZE_CACHE_MAX_LEN}, separators=(",", ":"))
+        assert len(raw) > _NORMALIZE_CACHE_MAX_LEN
+
+        assert json_str(raw) == json.dumps({"tokens": ["x"] * _NORMALIZE_CACHE_MAX_LEN})
+        assert _normalize_json_text_cached.cache_info().currsize == 0
+
+        json_str('{"temperature":  0.7}')
+        assert _normalize_json_text_cached.cache_info().currsize == 1